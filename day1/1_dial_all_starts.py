@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Land and touch counts for every start position of the dial.
+
+One pass over the movements builds a transform that holds the answer for
+all 100 start positions at once, instead of re-running the simulation
+100 times.
+"""
+import argparse
+import csv
+
+from dial import (DIAL_SIZE, START_POSITION, iter_movement_chunks,
+                  stream_transform, parallel_transform, transform_stats)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Day 1 dial counts for every start position"
+    )
+    parser.add_argument('filename', nargs='?', default='1.csv')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="split the file across this many processes")
+    parser.add_argument('--csv', dest='output',
+                        help="also write the table to this CSV file")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        transform = parallel_transform(args.filename, args.workers)
+    else:
+        transform = stream_transform(iter_movement_chunks(args.filename))
+    rows = [transform_stats(transform, start) for start in range(DIAL_SIZE)]
+
+    print("=" * 70)
+    print("DIAL POSITION 0 ANALYSIS FOR EVERY START POSITION")
+    print("=" * 70)
+    print(f"Total movements: {transform['movements']}")
+    print()
+    print(f"{'Start':>5} {'End':>5} {'Landed':>10} {'Touches':>12} "
+          f"{'Touched':>10} {'Multi':>10} {'Max':>5}")
+    for start, row in enumerate(rows):
+        marker = " *" if start == START_POSITION else ""
+        print(f"{start:>5} {row['end_position']:>5} "
+              f"{row['land_count']:>10} {row['touch_count']:>12} "
+              f"{row['movements_with_touches']:>10} "
+              f"{row['movements_with_multiple_touches']:>10} "
+              f"{row['max_touches']:>5}{marker}")
+    print("=" * 70)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['start', 'end', 'landed', 'touches',
+                             'touched', 'multi', 'max'])
+            for start, row in enumerate(rows):
+                writer.writerow([
+                    start, row['end_position'], row['land_count'],
+                    row['touch_count'], row['movements_with_touches'],
+                    row['movements_with_multiple_touches'],
+                    row['max_touches'],
+                ])
+        print(f"Table saved to '{args.output}'")
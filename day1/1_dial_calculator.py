@@ -1,33 +1,26 @@
 #!/usr/bin/env python3
+import numpy as np
 
-# Read the movements from the CSV file
-with open('1.csv', 'r') as f:
-    movements = [line.strip() for line in f if line.strip()]
+from dial import START_POSITION, iter_movement_chunks, dial_positions
 
 # Starting position
-position = 50
-zero_count = 0
-zero_positions = []
+position = START_POSITION
 
 print(f"Starting position: {position}")
 print()
 
-# Process each movement
-for i, movement in enumerate(movements, 1):
-    # Parse the movement
-    direction = movement[0]
-    value = int(movement[1:])
-
-    # Apply the movement
-    if direction == 'R':
-        position = (position + value) % 100
-    else:  # L
-        position = (position - value) % 100
-
-    # Check if we hit 0
-    if position == 0:
-        zero_count += 1
-        zero_positions.append(i)
+# Stream the movements, recording the 1-based movements that hit 0
+zero_positions = []
+offset = 0
+for movements in iter_movement_chunks('1.csv'):
+    if not len(movements):
+        continue
+    positions = dial_positions(movements, position)
+    zero_positions.extend((np.flatnonzero(positions == 0) + offset + 1)
+                          .tolist())
+    offset += len(movements)
+    position = int(positions[-1])
+zero_count = len(zero_positions)
 
 print()
 print("=" * 60)
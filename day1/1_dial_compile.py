@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Compile a day 1 movement log into its binary int32 cache.
+
+The other day 1 scripts memory-map the cache whenever it matches the log,
+so repeated analyses skip text parsing entirely.
+"""
+import sys
+
+from dial import compile_movements, open_cache
+
+if __name__ == "__main__":
+    filename = sys.argv[1] if len(sys.argv) > 1 else '1.csv'
+    cache = compile_movements(filename)
+    movements = open_cache(filename)
+    print(f"Compiled {len(movements)} movements from '{filename}' "
+          f"into '{cache}'")
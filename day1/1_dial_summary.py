@@ -1,74 +1,83 @@
 #!/usr/bin/env python3
+import argparse
 
-# Read the movements from the CSV file
-with open('1.csv', 'r') as f:
-    movements = [line.strip() for line in f if line.strip()]
+from dial import (START_POSITION, iter_movement_chunks, stream_summary,
+                  parallel_transform, transform_stats, incremental_summary,
+                  follow_summary)
 
-# Method 1: Count only when landing exactly on 0
-position = 50
-land_count = 0
-for movement in movements:
-    direction = movement[0]
-    value = int(movement[1:])
-    if direction == 'R':
-        position = (position + value) % 100
-    else:
-        position = (position - value) % 100
-    if position == 0:
-        land_count += 1
 
-# Method 2: Count every time dial touches/crosses 0 during movement
-position = 50
-touch_count = 0
-movement_with_touches = 0
-movements_with_multiple_touches = 0
-max_touches_in_one = 0
+def print_report(stats):
+    """Print the land/touch report for one summary"""
+    total_movements = stats['movements']
+    land_count = stats['land_count']
+    touch_count = stats['touch_count']
+    movement_with_touches = stats['movements_with_touches']
+    movements_with_multiple_touches = stats[
+        'movements_with_multiple_touches'
+    ]
+    max_touches_in_one = stats['max_touches']
 
-for movement in movements:
-    direction = movement[0]
-    value = int(movement[1:])
+    print("=" * 70)
+    print("DIAL POSITION 0 ANALYSIS")
+    print("=" * 70)
+    print(f"Starting position: {START_POSITION}")
+    print(f"Total movements: {total_movements}")
+    print()
+    print("METHOD 1: Counting only final landing position")
+    print(f"  Times landed exactly on 0: {land_count}")
+    print()
+    print("METHOD 2: Counting every touch/crossing during movement")
+    print(f"  Total zero touches/crossings: {touch_count}")
+    print(f"  Movements that touched 0 at least once: "
+          f"{movement_with_touches}")
+    print(f"  Movements that touched 0 multiple times: "
+          f"{movements_with_multiple_touches}")
+    print(f"  Maximum touches in a single movement: {max_touches_in_one}")
+    print()
+    print("DIFFERENCE")
+    print(f"  Additional touches from passing through 0: "
+          f"{touch_count - land_count}")
+    average = touch_count / total_movements if total_movements else 0
+    print(f"  Average touches per movement: {average:.2f}")
+    print("=" * 70)
 
-    touches = 0
-    if direction == 'R':
-        touches = (position + value) // 100
-    else:  # L
-        if position == 0:
-            touches = value // 100
-        elif value >= position:
-            touches = 1 + (value - position) // 100
 
-    touch_count += touches
-    if touches > 0:
-        movement_with_touches += 1
-    if touches > 1:
-        movements_with_multiple_touches += 1
-    if touches > max_touches_in_one:
-        max_touches_in_one = touches
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Day 1 dial summary")
+    parser.add_argument('filename', nargs='?', default='1.csv')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="split the file across this many processes")
+    parser.add_argument('--checkpoint',
+                        help="resume from this checkpoint and only read "
+                             "movements appended since the last run")
+    parser.add_argument('--follow', action='store_true',
+                        help="keep running and update as lines arrive")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="seconds between checks in --follow mode")
+    args = parser.parse_args()
 
-    if direction == 'R':
-        position = (position + value) % 100
+    # Method 1 (landing exactly on 0) and method 2 (every touch/crossing)
+    # come from the same pass over the CSV file
+    if args.follow:
+        updates = follow_summary(args.filename, args.checkpoint,
+                                 START_POSITION, args.interval)
+        print_report(next(updates))
+        try:
+            for stats in updates:
+                print(f"{stats['movements']} movements: "
+                      f"landed {stats['land_count']}, "
+                      f"touched {stats['touch_count']}, "
+                      f"max {stats['max_touches']} in one movement, "
+                      f"now at {stats['end_position']}", flush=True)
+        except KeyboardInterrupt:
+            pass
+    elif args.checkpoint:
+        print_report(incremental_summary(args.filename, args.checkpoint,
+                                         START_POSITION))
+    elif args.workers > 1:
+        print_report(transform_stats(
+            parallel_transform(args.filename, args.workers), START_POSITION
+        ))
     else:
-        position = (position - value) % 100
-
-print("=" * 70)
-print("DIAL POSITION 0 ANALYSIS")
-print("=" * 70)
-print("Starting position: 50")
-print(f"Total movements: {len(movements)}")
-print()
-print("METHOD 1: Counting only final landing position")
-print(f"  Times landed exactly on 0: {land_count}")
-print()
-print("METHOD 2: Counting every touch/crossing during movement")
-print(f"  Total zero touches/crossings: {touch_count}")
-print(f"  Movements that touched 0 at least once: "
-      f"{movement_with_touches}")
-print(f"  Movements that touched 0 multiple times: "
-      f"{movements_with_multiple_touches}")
-print(f"  Maximum touches in a single movement: {max_touches_in_one}")
-print()
-print("DIFFERENCE")
-print(f"  Additional touches from passing through 0: "
-      f"{touch_count - land_count}")
-print(f"  Average touches per movement: {touch_count / len(movements):.2f}")
-print("=" * 70)
+        print_report(stream_summary(iter_movement_chunks(args.filename),
+                                    START_POSITION))
@@ -0,0 +1,848 @@
+"""
+Vectorized dial engine for the day 1 movement logs.
+
+Movements are parsed into one signed integer array (R is positive, L is
+negative), so positions and zero touches come from array operations
+instead of a Python loop over every line. compile_movements() stores that
+array as a binary cache next to the log, which later runs memory-map
+instead of parsing the text again.
+"""
+import hashlib
+import heapq
+import json
+import os
+import struct
+import time
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+DIAL_SIZE = 100
+START_POSITION = 50
+# Blocks small enough that the parser's temporaries stay in cache
+CHUNK_BYTES = 1 << 19
+
+# Whitespace other than newlines, which is turned into newlines before
+# parsing, and the sign of each direction
+SPACES = b' \t\r'
+_SPACES_TO_NEWLINES = bytes.maketrans(SPACES, b'\n' * len(SPACES))
+_SIGNS = np.zeros(256, dtype=np.int8)
+_SIGNS[ord('R')] = 1
+_SIGNS[ord('L')] = -1
+# Longest movement that fits in int64
+MAX_DIGITS = 18
+
+# Cache header: magic, version, movement count, then the size, mtime and
+# SHA-256 of the text log it was compiled from
+CACHE_MAGIC = b'DIAL'
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct('<4sIQQq32s')
+
+
+def parse_movements(data: bytes) -> np.ndarray:
+    """
+    Parse raw 'R45' / 'L42' lines into a signed int64 array.
+
+    Works on the bytes directly: newline positions give each line's
+    direction byte and last digit, and the values are accumulated
+    positionally from there, adding the j-th last digit of every line
+    times 10 ** j. Each step is one gather over the lines, so the cost
+    is a few array passes per digit of the longest movement.
+    """
+    if any(space in data for space in SPACES):
+        data = data.translate(_SPACES_TO_NEWLINES)
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw == ord('\n'))
+    if len(raw) and raw[-1] != ord('\n'):
+        ends = np.append(ends, len(raw))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    np.add(ends[:-1], 1, out=starts[1:])
+    digits = ends - starts
+    digits -= 1
+    if len(digits) and digits.min() < 1:
+        # Skip blank lines
+        lines = digits >= 0
+        starts, ends, digits = starts[lines], ends[lines], digits[lines]
+    signs = _SIGNS.take(raw.take(starts))
+    # Every byte is a newline, the first byte of a line or one of the
+    # digits after it, so these checks cover the whole log
+    if len(digits) and (digits.min() < 1 or not signs.all()
+                        or np.count_nonzero(raw - ord('0') < 10)
+                        != digits.sum()):
+        raise ValueError("Malformed movement: expected R or L followed "
+                         "by digits on each line")
+    width = int(digits.max()) if len(digits) else 0
+    if width > MAX_DIGITS:
+        raise ValueError("Movement does not fit in int64")
+
+    # Accumulate in the narrowest type that holds width digits
+    ends -= 1
+    values = raw.take(ends).astype(np.min_scalar_type(10 ** width - 1))
+    values -= ord('0')
+    digit = np.empty(len(ends), dtype=np.uint8)
+    shortest = int(digits.min()) if len(digits) else 0
+    for j in range(1, width):
+        ends -= 1
+        raw.take(ends, out=digit)
+        digit -= ord('0')
+        if j >= shortest:
+            # Lines with j digits or fewer have reached their direction
+            digit *= digits > j
+        values += digit * values.dtype.type(10 ** j)
+    moves = values.astype(np.int64)
+    moves *= signs
+    return moves
+
+
+def cache_path(filename: str) -> str:
+    """Where the binary cache of a movement log lives."""
+    return filename + '.bin'
+
+
+def file_digest(filename: str) -> bytes:
+    """SHA-256 of a file, read in bounded blocks."""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_BYTES), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def compile_movements(filename: str, cache: str = None) -> str:
+    """
+    Convert a text movement log into a binary int32 cache.
+
+    The movements follow a fixed header that records the source size,
+    mtime and content hash, so stale caches can be detected.
+    """
+    cache = cache or cache_path(filename)
+    info = os.stat(filename)
+    digest = file_digest(filename)
+    count = 0
+    with open(cache + '.tmp', 'wb') as out:
+        out.write(b'\0' * CACHE_HEADER.size)
+        for moves in iter_movement_chunks(filename, use_cache=False):
+            if len(moves) and np.abs(moves).max() > np.iinfo(np.int32).max:
+                raise ValueError("Movement does not fit in int32")
+            out.write(moves.astype('<i4').tobytes())
+            count += len(moves)
+        out.seek(0)
+        out.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, count,
+                                    info.st_size, info.st_mtime_ns, digest))
+    os.replace(cache + '.tmp', cache)
+    return cache
+
+
+def open_cache(filename: str, cache: str = None) -> Optional[np.ndarray]:
+    """
+    Memory-map the cached movements of a log, or None if there is no
+    cache or it no longer matches the log.
+
+    A matching size and mtime are trusted as is; otherwise the content
+    hash decides, so touching the log does not invalidate the cache.
+    """
+    cache = cache or cache_path(filename)
+    try:
+        with open(cache, 'rb') as f:
+            header = f.read(CACHE_HEADER.size)
+        info = os.stat(filename)
+    except OSError:
+        return None
+    if len(header) != CACHE_HEADER.size:
+        return None
+    magic, version, count, size, mtime_ns, digest = \
+        CACHE_HEADER.unpack(header)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        return None
+    if size != info.st_size:
+        return None
+    if mtime_ns != info.st_mtime_ns and digest != file_digest(filename):
+        return None
+    if not count:
+        return np.zeros(0, dtype='<i4')
+    return np.memmap(cache, dtype='<i4', mode='r',
+                     offset=CACHE_HEADER.size, shape=(count,))
+
+
+def load_movements(filename: str, use_cache: bool = True) -> np.ndarray:
+    """
+    Read a movement log into a signed integer array, memory-mapping its
+    binary cache when it is fresh.
+    """
+    if use_cache:
+        cached = open_cache(filename)
+        if cached is not None:
+            return cached
+    with open(filename, 'rb') as f:
+        return parse_movements(f.read())
+
+
+def iter_movement_chunks(filename: str, chunk_bytes: int = CHUNK_BYTES,
+                         use_cache: bool = True) -> Iterator[np.ndarray]:
+    """
+    Yield the movement log as arrays of at most about chunk_bytes of text.
+
+    Blocks are cut on the last newline so no movement is split, which
+    keeps memory flat no matter how large the log grows. With a fresh
+    cache the chunks are zero-copy views of the memory-mapped file.
+    """
+    cached = open_cache(filename) if use_cache else None
+    if cached is not None:
+        step = max(1, chunk_bytes // cached.itemsize)
+        for begin in range(0, len(cached), step):
+            yield cached[begin:begin + step]
+        return
+    with open(filename, 'rb') as f:
+        tail = b''
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n') + 1
+            tail = block[cut:]
+            if cut:
+                yield parse_movements(block[:cut])
+        if tail.strip():
+            yield parse_movements(tail)
+
+
+def movement_label(value: int) -> str:
+    """Format a signed movement back into its 'R45' / 'L42' form."""
+    return f"R{value}" if value >= 0 else f"L{-value}"
+
+
+def _unwrap(moves: np.ndarray,
+            start: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Full turns of the unwrapped dial and position after each movement."""
+    positions = np.cumsum(moves, dtype=np.int64)
+    positions += start
+    turns = positions // DIAL_SIZE
+    positions -= turns * DIAL_SIZE
+    return turns, positions
+
+
+def _count_touches(moves: np.ndarray, turns: np.ndarray,
+                   positions: np.ndarray, start: int) -> np.ndarray:
+    """
+    Zero touches of each movement from the turns and positions after it.
+
+    A right move touches 0 once per multiple of 100 in (u_before, u_after]
+    of the unwrapped dial u, which is the difference of their turns. A
+    left move counts the multiples in [u_after, u_before) instead, which
+    is the same difference once a position of exactly 0 is counted in the
+    turn below it.
+    """
+    touches = np.empty(len(moves), dtype=np.int64)
+    if not len(moves):
+        return touches
+    left = moves < 0
+    on_zero = positions == 0
+    np.subtract(turns, left & on_zero, out=touches)
+    before = np.empty_like(turns)
+    before[0] = (start // DIAL_SIZE
+                 - (bool(left[0]) and start % DIAL_SIZE == 0))
+    np.subtract(turns[:-1], left[1:] & on_zero[:-1], out=before[1:])
+    touches -= before
+    return np.abs(touches, out=touches)
+
+
+def dial_positions(moves: np.ndarray,
+                   start: int = START_POSITION) -> np.ndarray:
+    """Dial position after each movement."""
+    return _unwrap(moves, start)[1]
+
+
+def zero_touches(moves: np.ndarray,
+                 start: int = START_POSITION) -> np.ndarray:
+    """
+    Number of times each movement touches or crosses 0.
+
+    Every count is a difference of floor divisions on the unwrapped dial
+    u = start + cumsum(moves), which matches the case analysis in
+    1_dial_calculator_touches.py without branching per movement.
+    """
+    return _count_touches(moves, *_unwrap(moves, start), start)
+
+
+def dial_run(moves: np.ndarray, start: int = START_POSITION
+             ) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions and zero touches of each movement from one cumsum."""
+    turns, positions = _unwrap(moves, start)
+    return positions, _count_touches(moves, turns, positions, start)
+
+
+def positions_before(positions: np.ndarray, start: int) -> np.ndarray:
+    """Dial position before each movement."""
+    before = np.empty_like(positions)
+    before[:1] = start
+    before[1:] = positions[:-1]
+    return before
+
+
+def summarize(moves: np.ndarray, start: int = START_POSITION) -> Dict:
+    """Land and touch statistics for one pass over the movements."""
+    positions, touches = dial_run(moves, start)
+    return {
+        'movements': len(moves),
+        'land_count': int(np.count_nonzero(positions == 0)),
+        'touch_count': int(touches.sum()),
+        'movements_with_touches': int(np.count_nonzero(touches > 0)),
+        'movements_with_multiple_touches': int(
+            np.count_nonzero(touches > 1)
+        ),
+        'max_touches': int(touches.max()) if len(touches) else 0,
+        'end_position': int(positions[-1]) if len(positions) else start,
+    }
+
+
+def stream_summary(chunks: Iterable[np.ndarray],
+                   start: int = START_POSITION, top_n: int = 10) -> Dict:
+    """
+    Fold summarize() over a stream of movement chunks.
+
+    Only bounded state is kept between chunks: the counters, the first
+    top_n multi-touch movements and a heap of the top_n movements with the
+    most touches. Details are dicts with movement_num, movement, from, to
+    and touches keys.
+    """
+    stats = {
+        'movements': 0,
+        'land_count': 0,
+        'touch_count': 0,
+        'movements_with_touches': 0,
+        'movements_with_multiple_touches': 0,
+        'max_touches': 0,
+        'end_position': start,
+    }
+    first_multi: List[Dict] = []
+    heap: List[tuple] = []
+    position = start
+
+    for moves in chunks:
+        if not len(moves):
+            continue
+        positions, touches = dial_run(moves, position)
+        before = positions_before(positions, position)
+        offset = stats['movements']
+
+        def detail(i):
+            return {
+                'movement_num': offset + int(i) + 1,
+                'movement': movement_label(int(moves[i])),
+                'from': int(before[i]),
+                'to': int(positions[i]),
+                'touches': int(touches[i]),
+            }
+
+        stats['movements'] += len(moves)
+        stats['land_count'] += int(np.count_nonzero(positions == 0))
+        stats['touch_count'] += int(touches.sum())
+        stats['movements_with_touches'] += int(np.count_nonzero(touches))
+        multi = np.flatnonzero(touches > 1)
+        stats['movements_with_multiple_touches'] += len(multi)
+        stats['max_touches'] = max(stats['max_touches'], int(touches.max()))
+
+        for i in multi[:top_n - len(first_multi)]:
+            first_multi.append(detail(i))
+
+        # Only the chunk's own top_n can enter the global top_n, and once
+        # the heap is full only movements with more touches than its
+        # smallest (ties keep the earlier movement)
+        if top_n:
+            candidates = (np.flatnonzero(touches > heap[0][0])
+                          if len(heap) == top_n
+                          else np.arange(len(moves)))
+            if len(candidates) > top_n:
+                # Everything above the top_n-th largest count, then the
+                # earliest of the movements tied with it
+                values = touches[candidates]
+                cut = np.partition(values, len(values) - top_n)[-top_n]
+                keep = values > cut
+                tied = np.flatnonzero(values == cut)
+                keep[tied[:top_n - np.count_nonzero(keep)]] = True
+                candidates = candidates[keep]
+            for i in sorted(candidates):
+                item = (int(touches[i]), -(offset + int(i)))
+                if len(heap) < top_n:
+                    heapq.heappush(heap, (*item, detail(i)))
+                elif item > heap[0][:2]:
+                    heapq.heapreplace(heap, (*item, detail(i)))
+
+        position = int(positions[-1])
+
+    stats['end_position'] = position
+    stats['first_multi_touch'] = first_multi
+    stats['top_touches'] = [d for *_, d in sorted(heap, reverse=True)]
+    return stats
+
+
+def count_zero_touches_manual(start_pos, direction, value):
+    """Manually count by simulating each step"""
+    count = 0
+    pos = start_pos
+    for step in range(value):
+        if direction == 'R':
+            pos = (pos + 1) % 100
+        else:  # L
+            pos = (pos - 1) % 100
+        if pos == 0:
+            count += 1
+    return count, pos
+
+
+def case_touches(before: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    """
+    The per-movement case analysis of 1_dial_calculator_touches.py,
+    applied to whole arrays of start positions and movements.
+    """
+    distance = np.abs(moves)
+    right = (before + distance) // DIAL_SIZE
+    # The left-move cases without branching: V >= P > 0 gives
+    # 1 + (V - P) // 100, which is already 0 when V < P since then
+    # -100 < V - P < 0, and P = 0 gives V // 100, one less
+    left = (distance - before) // DIAL_SIZE
+    left += before != 0
+    right -= left
+    right *= moves >= 0
+    right += left
+    return right
+
+
+def reference_touches(before: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    """
+    Independent O(1) reference for the zero touches of each movement.
+
+    Instead of floor divisions on the unwrapped dial, this finds the
+    first step k that lands on 0 (100 - P moving right, P moving left,
+    or a full turn when that is 0) and counts it plus one more for every
+    further 100 steps, which is what stepping one position at a time does.
+    """
+    distance = np.abs(moves)
+    first = np.abs((moves >= 0) * DIAL_SIZE - before)
+    first += (first == 0) * DIAL_SIZE
+    # A movement shorter than its first hit has -100 <= V - k < 0
+    return 1 + (distance - first) // DIAL_SIZE
+
+
+def new_verification() -> Dict:
+    """Empty results for check_touches() and sample_touches()."""
+    return {'checked': 0, 'sampled': 0, 'stepped': 0, 'mismatches': []}
+
+
+def _report(result: Dict, mismatch: Dict, max_report: int):
+    if len(result['mismatches']) < max_report:
+        result['mismatches'].append(mismatch)
+
+
+def _check_run(result: Dict, moves: np.ndarray, position: int,
+               offset: Optional[int], max_report: int
+               ) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Compare the engine, case analysis and reference on one run of
+    movements, and return the positions before each movement, the
+    reference touches and the final position.
+    """
+    positions = dial_positions(moves, position)
+    before = positions_before(positions, position)
+    engine = zero_touches(moves, position)
+    cases = case_touches(before, moves)
+    reference = reference_touches(before, moves)
+    for i in np.flatnonzero((engine != reference)
+                            | (cases != reference))[:max_report]:
+        _report(result, {
+            'movement_num': (None if offset is None
+                             else offset + int(i) + 1),
+            'movement': movement_label(int(moves[i])),
+            'from': int(before[i]),
+            'engine': int(engine[i]),
+            'cases': int(cases[i]),
+            'reference': int(reference[i]),
+        }, max_report)
+    return before, reference, int(positions[-1])
+
+
+def check_touches(chunks: Iterable[np.ndarray], result: Dict,
+                  start: int = START_POSITION,
+                  max_report: int = 10) -> Iterator[np.ndarray]:
+    """
+    Pass movement chunks through unchanged while checking every movement
+    with the vectorized engine, the case analysis and the first-hit
+    reference, so a summary can share the same pass over a log.
+    """
+    position = start
+    for moves in chunks:
+        if len(moves):
+            _, _, position = _check_run(result, moves, position,
+                                        result['checked'], max_report)
+            result['checked'] += len(moves)
+        yield moves
+
+
+def sample_touches(result: Dict, samples: int = 1000, seed: int = 0,
+                   max_report: int = 10):
+    """
+    Check `samples` random movements of up to 10^12 steps the way
+    check_touches() does, and the ones short enough to step through also
+    by manual stepping.
+    """
+    if not samples:
+        return
+    # A mix of short movements that can be stepped through and ones far
+    # larger than any log holds
+    rng = np.random.default_rng(seed)
+    largest = rng.choice([1_000, 10**6, 10**12], size=samples)
+    moves = (rng.integers(0, largest, endpoint=True)
+             * rng.choice([1, -1], size=samples))
+    before, reference, _ = _check_run(result, moves,
+                                      int(rng.integers(DIAL_SIZE)), None,
+                                      max_report)
+    result['sampled'] += samples
+    for i in np.flatnonzero(np.abs(moves) <= 1_000):
+        value = int(moves[i])
+        manual, _ = count_zero_touches_manual(
+            int(before[i]), 'R' if value >= 0 else 'L', abs(value)
+        )
+        result['stepped'] += 1
+        if manual != reference[i]:
+            _report(result, {
+                'movement_num': None,
+                'movement': movement_label(value),
+                'from': int(before[i]),
+                'manual': manual,
+                'reference': int(reference[i]),
+            }, max_report)
+
+
+def verify_touches(chunks: Iterable[np.ndarray],
+                   start: int = START_POSITION, samples: int = 1000,
+                   seed: int = 0, max_report: int = 10) -> Dict:
+    """
+    Cross-check the touch formulas over a whole log and random samples.
+
+    Returns the number of movements checked and the first mismatches.
+    """
+    result = new_verification()
+    for _ in check_touches(chunks, result, start, max_report):
+        pass
+    sample_touches(result, samples, seed, max_report)
+    return result
+
+
+def _interval_counts(first: np.ndarray, length: np.ndarray) -> np.ndarray:
+    """
+    For every start position, count the cyclic intervals
+    [first, first + length) on the dial that contain it.
+    """
+    edges = (np.bincount(first, minlength=2 * DIAL_SIZE)
+             - np.bincount(first + length, minlength=2 * DIAL_SIZE))
+    covered = np.cumsum(edges)
+    return covered[:DIAL_SIZE] + covered[DIAL_SIZE:]
+
+
+def identity_transform() -> Dict:
+    """The transform of an empty run of movements."""
+    return {
+        'movements': 0,
+        'offset': 0,
+        'land': np.zeros(DIAL_SIZE, dtype=np.int64),
+        'touch': np.zeros(DIAL_SIZE, dtype=np.int64),
+        'touched': np.zeros(DIAL_SIZE, dtype=np.int64),
+        'multi': np.zeros(DIAL_SIZE, dtype=np.int64),
+        'peak': np.zeros(DIAL_SIZE, dtype=np.int64),
+    }
+
+
+def dial_transform(moves: np.ndarray) -> Dict:
+    """
+    Summarise movements as a function of the start position.
+
+    The dict holds the total offset plus, for each of the 100 start
+    positions, the land count, touch count, movements that touched 0,
+    movements that touched 0 more than once, and the peak touches of a
+    single movement. Each movement touches floor(V / 100) times plus one
+    more when its start lies in a window of V % 100 positions, so every
+    table is built with bincounts in O(n + 100) rather than 100 runs.
+    """
+    transform = identity_transform()
+    if not len(moves):
+        return transform
+    shifts = np.cumsum(moves) % DIAL_SIZE
+    shift_before = positions_before(shifts, 0)
+    distance = np.abs(moves)
+    laps = distance // DIAL_SIZE
+    rest = distance % DIAL_SIZE
+
+    # The extra touch happens when the position before the movement is in
+    # [100 - rest, 99] moving right, or in [1, rest] moving left
+    window = np.where(moves >= 0, DIAL_SIZE - rest, 1)
+    first = (window - shift_before) % DIAL_SIZE
+
+    def extra(mask):
+        return _interval_counts(first[mask], rest[mask])
+
+    peak = int(laps.max())
+    transform['movements'] = len(moves)
+    transform['offset'] = int(shifts[-1])
+    transform['land'] = np.bincount((-shifts) % DIAL_SIZE,
+                                    minlength=DIAL_SIZE)
+    transform['touch'] = int(laps.sum()) + extra(rest > 0)
+    transform['touched'] = int(np.count_nonzero(laps)) + extra(laps == 0)
+    transform['multi'] = (int(np.count_nonzero(laps > 1))
+                          + extra(laps == 1))
+    transform['peak'] = peak + (extra(laps == peak) > 0)
+    return transform
+
+
+def compose_transforms(first: Dict, second: Dict) -> Dict:
+    """Transform of running the first movements and then the second."""
+    shifted = (np.arange(DIAL_SIZE) + first['offset']) % DIAL_SIZE
+    composed = {
+        'movements': first['movements'] + second['movements'],
+        'offset': (first['offset'] + second['offset']) % DIAL_SIZE,
+    }
+    # Transforms may carry only some of the tables (e.g. land and touch)
+    for key in ('land', 'touch', 'touched', 'multi'):
+        if key in first:
+            composed[key] = first[key] + second[key][shifted]
+    if 'peak' in first:
+        composed['peak'] = np.maximum(first['peak'], second['peak'][shifted])
+    return composed
+
+
+def transform_stats(transform: Dict, start: int = START_POSITION) -> Dict:
+    """Evaluate a transform at one start position, like summarize()."""
+    return {
+        'movements': transform['movements'],
+        'land_count': int(transform['land'][start]),
+        'touch_count': int(transform['touch'][start]),
+        'movements_with_touches': int(transform['touched'][start]),
+        'movements_with_multiple_touches': int(transform['multi'][start]),
+        'max_touches': int(transform['peak'][start]),
+        'end_position': (start + transform['offset']) % DIAL_SIZE,
+    }
+
+
+def stream_transform(chunks: Iterable[np.ndarray]) -> Dict:
+    """Compose the transforms of a stream of movement chunks."""
+    transform = identity_transform()
+    for moves in chunks:
+        transform = compose_transforms(transform, dial_transform(moves))
+    return transform
+
+
+def split_byte_ranges(filename: str, parts: int) -> List[Tuple[int, int]]:
+    """Split a file into up to `parts` byte ranges on line boundaries."""
+    size = os.path.getsize(filename)
+    bounds = [0]
+    with open(filename, 'rb') as f:
+        for part in range(1, parts):
+            target = max(size * part // parts, bounds[-1])
+            f.seek(target)
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(begin, end) for begin, end in zip(bounds, bounds[1:])
+            if end > begin]
+
+
+def range_transform(args: Tuple[str, int, int]) -> Dict:
+    """Transform of the movements stored in one byte range of a file."""
+    filename, begin, end = args
+    transform = identity_transform()
+    with open(filename, 'rb') as f:
+        f.seek(begin)
+        while begin < end:
+            block = f.read(min(CHUNK_BYTES, end - begin))
+            begin += len(block)
+            if begin < end:
+                # Finish the line so no movement is split across blocks
+                extra = f.readline()
+                block += extra
+                begin += len(extra)
+            transform = compose_transforms(
+                transform, dial_transform(parse_movements(block))
+            )
+    return transform
+
+
+def cached_range_transform(args: Tuple[str, int, int]) -> Dict:
+    """Transform of movements [begin, end) of a binary cache."""
+    cache, begin, end = args
+    with open(cache, 'rb') as f:
+        count = CACHE_HEADER.unpack(f.read(CACHE_HEADER.size))[2]
+    moves = np.memmap(cache, dtype='<i4', mode='r',
+                      offset=CACHE_HEADER.size, shape=(count,))
+    step = CHUNK_BYTES // moves.itemsize
+    return stream_transform(moves[b:min(b + step, end)]
+                            for b in range(begin, end, step))
+
+
+def parallel_transform(filename: str, num_workers: int = None,
+                       chunks_per_worker: int = 4) -> Dict:
+    """
+    Transform of a whole movement log, computed by a process pool.
+
+    The file is split into byte ranges on line boundaries, each worker
+    builds the transform of its ranges, and the results are composed in
+    file order, so the answer is exactly the serial one.
+    """
+    if num_workers is None:
+        num_workers = cpu_count()
+    parts = num_workers * chunks_per_worker
+    cached = open_cache(filename)
+    if cached is not None:
+        # Split the cache by movement index instead of by text bytes
+        bounds = np.linspace(0, len(cached), parts + 1).astype(int)
+        worker = cached_range_transform
+        tasks = [(cache_path(filename), int(b), int(e))
+                 for b, e in zip(bounds, bounds[1:]) if e > b]
+    else:
+        worker = range_transform
+        tasks = [(filename, b, e)
+                 for b, e in split_byte_ranges(filename, parts)]
+    transform = identity_transform()
+    with Pool(processes=num_workers) as pool:
+        for part in pool.imap(worker, tasks):
+            transform = compose_transforms(transform, part)
+    return transform
+
+
+def read_tail(filename: str, offset: int, chunk_bytes: int = CHUNK_BYTES,
+              partial: bool = False) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    Yield (movements, offset after them) for the complete lines after
+    byte `offset`. A trailing line without its newline is left for the
+    next read, since it may still be being written, unless `partial` is
+    set, in which case it is yielded last.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        tail = b''
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n') + 1
+            tail = block[cut:]
+            if cut:
+                offset += cut
+                yield parse_movements(block[:cut]), offset
+        if partial and tail.strip():
+            yield parse_movements(tail), offset + len(tail)
+
+
+def new_checkpoint(filename: str, start: int = START_POSITION) -> Dict:
+    """Checkpoint of a log that has not been read yet."""
+    return {
+        'filename': os.path.abspath(filename),
+        'start': start,
+        'offset': 0,
+        'stats': {
+            'movements': 0,
+            'land_count': 0,
+            'touch_count': 0,
+            'movements_with_touches': 0,
+            'movements_with_multiple_touches': 0,
+            'max_touches': 0,
+            'end_position': start,
+        },
+    }
+
+
+def load_checkpoint(path: str, filename: str,
+                    start: int = START_POSITION) -> Dict:
+    """
+    Load the checkpoint for a log, or start a new one if there is none or
+    it belongs to another log or start position.
+    """
+    try:
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return new_checkpoint(filename, start)
+    if (checkpoint.get('filename') != os.path.abspath(filename)
+            or checkpoint.get('start') != start):
+        return new_checkpoint(filename, start)
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: Dict):
+    """Atomically write a checkpoint."""
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def advance_checkpoint(checkpoint: Dict) -> int:
+    """
+    Fold the movements appended since the checkpoint into its statistics
+    and return how many there were. A log that shrank was rewritten, so
+    it is read again from the beginning.
+    """
+    filename = checkpoint['filename']
+    if os.path.getsize(filename) < checkpoint['offset']:
+        checkpoint.update(new_checkpoint(filename, checkpoint['start']))
+    added = 0
+    for moves, offset in read_tail(filename, checkpoint['offset']):
+        _fold_stats(checkpoint['stats'], moves)
+        checkpoint['offset'] = offset
+        added += len(moves)
+    return added
+
+
+def _fold_stats(stats: Dict, moves: np.ndarray):
+    """Add the counters of movements that follow `stats`, in place."""
+    part = stream_summary([moves], stats['end_position'], top_n=0)
+    for key in ('movements', 'land_count', 'touch_count',
+                'movements_with_touches', 'movements_with_multiple_touches'):
+        stats[key] += part[key]
+    stats['max_touches'] = max(stats['max_touches'], part['max_touches'])
+    stats['end_position'] = part['end_position']
+
+
+def incremental_summary(filename: str, checkpoint_path: str = None,
+                        start: int = START_POSITION) -> Dict:
+    """
+    Summary of a growing log that only reads what was appended since the
+    last run, resuming from (and updating) checkpoint_path.
+
+    A last line without its newline is counted in the summary but not in
+    the checkpoint, so the next run reads it again once it is complete.
+    """
+    if checkpoint_path:
+        checkpoint = load_checkpoint(checkpoint_path, filename, start)
+    else:
+        checkpoint = new_checkpoint(filename, start)
+    advance_checkpoint(checkpoint)
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, checkpoint)
+    stats = dict(checkpoint['stats'])
+    for moves, _ in read_tail(filename, checkpoint['offset'], partial=True):
+        _fold_stats(stats, moves)
+    return stats
+
+
+def follow_summary(filename: str, checkpoint_path: str = None,
+                   start: int = START_POSITION,
+                   interval: float = 1.0) -> Iterator[Dict]:
+    """
+    Yield the summary of a log now and again whenever lines are appended,
+    polling every `interval` seconds. The checkpoint is saved after each
+    update so a restart picks up where the last one stopped.
+    """
+    if checkpoint_path:
+        checkpoint = load_checkpoint(checkpoint_path, filename, start)
+    else:
+        checkpoint = new_checkpoint(filename, start)
+    first = True
+    while True:
+        if advance_checkpoint(checkpoint) or first:
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, checkpoint)
+            yield dict(checkpoint['stats'])
+            first = False
+        time.sleep(interval)
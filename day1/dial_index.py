@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Segment tree over the day 1 movements for range queries and updates.
+
+Leaves hold the land/touch transform (see dial.py) of a fixed-size block
+of movements and every inner node holds the composition of its two
+children, so zero touches between any two movements, for any entry
+position, come from O(log n) node compositions plus at most two partial
+blocks. Changing one movement only rebuilds its leaf and the path to the
+root.
+
+Usage:
+    python dial_index.py build [1.csv] [1.csv.idx.npz]
+    python dial_index.py query 1.csv.idx.npz queries.txt [--save]
+
+Query files have one command per line:
+    range I J [ENTRY]   lands/touches during movements I..J (1-based)
+    set K R45           replace movement K
+    total [START]       lands/touches for the whole log
+"""
+import argparse
+from typing import Dict
+
+import numpy as np
+
+from dial import (DIAL_SIZE, START_POSITION, load_movements, movement_label,
+                  parse_movements, dial_transform, compose_transforms)
+
+BLOCK_SIZE = 256
+TABLES = ('land', 'touch')
+USAGE = {
+    'range': 'range I J [ENTRY]',
+    'set': 'set K R45',
+    'total': 'total [START]',
+}
+
+
+def _land_touch(transform: Dict) -> Dict:
+    """Keep only the tables the index stores."""
+    return {key: transform[key]
+            for key in ('movements', 'offset') + TABLES}
+
+
+class DialSegmentTree:
+    """Segment tree of land/touch transforms over blocks of movements."""
+
+    def __init__(self, moves: np.ndarray, block_size: int = BLOCK_SIZE):
+        self.moves = np.array(moves, dtype=np.int64)
+        self.block_size = block_size
+        blocks = max(1, -(-len(self.moves) // block_size))
+        self.size = 1 << (blocks - 1).bit_length()
+
+        nodes = 2 * self.size
+        self.count = np.zeros(nodes, dtype=np.int64)
+        self.offset = np.zeros(nodes, dtype=np.int64)
+        self.land = np.zeros((nodes, DIAL_SIZE), dtype=np.int64)
+        self.touch = np.zeros((nodes, DIAL_SIZE), dtype=np.int64)
+
+        for block in range(blocks):
+            self._set_leaf(block)
+        # Build each level from the one below in a single vectorized step
+        level = self.size // 2
+        while level:
+            self._pull(np.arange(level, 2 * level))
+            level //= 2
+
+    def __len__(self):
+        return len(self.moves)
+
+    def _set_leaf(self, block: int):
+        """Recompute the transform of one block of movements."""
+        begin = block * self.block_size
+        transform = dial_transform(
+            self.moves[begin:begin + self.block_size]
+        )
+        node = self.size + block
+        self.count[node] = transform['movements']
+        self.offset[node] = transform['offset']
+        self.land[node] = transform['land']
+        self.touch[node] = transform['touch']
+
+    def _pull(self, nodes: np.ndarray):
+        """Recompute inner nodes from their children."""
+        left = 2 * nodes
+        right = left + 1
+        shifted = (np.arange(DIAL_SIZE)
+                   + self.offset[left][:, None]) % DIAL_SIZE
+        rows = right[:, None]
+        self.count[nodes] = self.count[left] + self.count[right]
+        self.offset[nodes] = (self.offset[left]
+                              + self.offset[right]) % DIAL_SIZE
+        self.land[nodes] = self.land[left] + self.land[rows, shifted]
+        self.touch[nodes] = self.touch[left] + self.touch[rows, shifted]
+
+    def _node(self, node: int) -> Dict:
+        return {
+            'movements': int(self.count[node]),
+            'offset': int(self.offset[node]),
+            'land': self.land[node],
+            'touch': self.touch[node],
+        }
+
+    def _slice(self, begin: int, end: int) -> Dict:
+        """Transform of movements [begin, end) computed directly."""
+        return _land_touch(dial_transform(self.moves[begin:end]))
+
+    def _blocks(self, first: int, last: int) -> Dict:
+        """Transform of whole blocks [first, last) from the tree."""
+        left = self._slice(0, 0)
+        right = self._slice(0, 0)
+        first += self.size
+        last += self.size
+        while first < last:
+            if first & 1:
+                left = compose_transforms(left, self._node(first))
+                first += 1
+            if last & 1:
+                last -= 1
+                right = compose_transforms(self._node(last), right)
+            first //= 2
+            last //= 2
+        return compose_transforms(left, right)
+
+    def transform(self, begin: int, end: int) -> Dict:
+        """Land/touch transform of movements [begin, end), 0-based."""
+        begin = max(begin, 0)
+        end = min(end, len(self.moves))
+        if end <= begin:
+            return self._slice(0, 0)
+        first = begin // self.block_size
+        last = (end - 1) // self.block_size
+        if first == last:
+            return self._slice(begin, end)
+        middle = self._blocks(first + 1, last)
+        head = self._slice(begin, (first + 1) * self.block_size)
+        tail = self._slice(last * self.block_size, end)
+        return compose_transforms(compose_transforms(head, middle), tail)
+
+    def range_query(self, first: int, last: int, entry: int = None,
+                    start: int = START_POSITION) -> Dict:
+        """
+        Lands and touches during movements first..last (1-based,
+        inclusive). Without an explicit entry position, the dial enters
+        movement `first` where the real run from `start` left it.
+        """
+        # Out-of-range bounds would otherwise be clipped or wrap around
+        if not 1 <= first <= last <= len(self):
+            raise ValueError(f"Movement range {first}..{last} is outside "
+                             f"1..{len(self)}")
+        if entry is None:
+            entry = (start + self.transform(0, first - 1)['offset']) \
+                % DIAL_SIZE
+        return self._result(entry, self.transform(first - 1, last))
+
+    @staticmethod
+    def _result(entry: int, transform: Dict) -> Dict:
+        """Lands and touches of a transform entered at `entry`."""
+        if not 0 <= entry < DIAL_SIZE:
+            raise ValueError(f"Entry position {entry} is outside "
+                             f"0..{DIAL_SIZE - 1}")
+        return {
+            'entry_position': entry,
+            'exit_position': (entry + transform['offset']) % DIAL_SIZE,
+            'land_count': int(transform['land'][entry]),
+            'touch_count': int(transform['touch'][entry]),
+        }
+
+    def total(self, start: int = START_POSITION) -> Dict:
+        """Lands and touches over the whole log."""
+        return self._result(start, self.transform(0, len(self)))
+
+    def movement(self, index: int) -> int:
+        """Movement `index` (1-based)."""
+        self._check_index(index)
+        return int(self.moves[index - 1])
+
+    def _check_index(self, index: int):
+        # A 0 or negative index would wrap around to the end of the log
+        if not 1 <= index <= len(self):
+            raise ValueError(f"Movement index {index} is outside "
+                             f"1..{len(self)}")
+
+    def update(self, index: int, value: int):
+        """Replace movement `index` (1-based) and fix the path to the root."""
+        self._check_index(index)
+        self.moves[index - 1] = value
+        block = (index - 1) // self.block_size
+        self._set_leaf(block)
+        node = (self.size + block) // 2
+        while node:
+            self._pull(np.array([node]))
+            node //= 2
+
+    def save(self, filename: str):
+        """Persist the movements and every node of the tree."""
+        np.savez(filename, moves=self.moves, block_size=self.block_size,
+                 count=self.count, offset=self.offset, land=self.land,
+                 touch=self.touch)
+
+    @classmethod
+    def load(cls, filename: str) -> 'DialSegmentTree':
+        """Load a tree saved with save() without rebuilding it."""
+        data = np.load(filename)
+        tree = cls.__new__(cls)
+        tree.moves = data['moves']
+        tree.block_size = int(data['block_size'])
+        tree.count = data['count']
+        tree.offset = data['offset']
+        tree.land = data['land']
+        tree.touch = data['touch']
+        tree.size = len(tree.count) // 2
+        return tree
+
+
+def run_query(tree: DialSegmentTree, line: str) -> str:
+    """Run one query-file command and describe its result."""
+    parts = line.split()
+    command, args = parts[0], parts[1:]
+    if command not in USAGE:
+        raise ValueError(f"Unknown query: {line}")
+    # Every argument of a usage line is required unless bracketed
+    words = USAGE[command].split()[1:]
+    required = sum(not word.startswith('[') for word in words)
+    if not required <= len(args) <= len(words):
+        raise ValueError(f"Usage: {USAGE[command]}")
+    if command == 'range':
+        first, last = int(args[0]), int(args[1])
+        entry = int(args[2]) if len(args) > 2 else None
+        result = tree.range_query(first, last, entry)
+        return (f"range {first}..{last} from {result['entry_position']} "
+                f"to {result['exit_position']}: "
+                f"landed {result['land_count']}, "
+                f"touched {result['touch_count']}")
+    if command == 'set':
+        index = int(args[0])
+        value = int(parse_movements(args[1].encode())[0])
+        old = movement_label(tree.movement(index))
+        tree.update(index, value)
+        return f"set {index}: {old} -> {movement_label(value)}"
+    start = int(args[0]) if args else START_POSITION
+    result = tree.total(start)
+    return (f"total from {start}: landed {result['land_count']}, "
+            f"touched {result['touch_count']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Segment tree index over day 1 movements"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="index a movement log")
+    build.add_argument('filename', nargs='?', default='1.csv')
+    build.add_argument('index', nargs='?',
+                       help="index file (default: FILENAME.idx.npz)")
+    build.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+    query = commands.add_parser('query', help="run a batch of queries")
+    query.add_argument('index')
+    query.add_argument('queries')
+    query.add_argument('--save', action='store_true',
+                       help="write point updates back to the index")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        index = args.index or args.filename + '.idx.npz'
+        tree = DialSegmentTree(load_movements(args.filename),
+                               args.block_size)
+        tree.save(index)
+        print(f"Indexed {len(tree)} movements into '{index}'")
+    else:
+        tree = DialSegmentTree.load(args.index)
+        with open(args.queries, 'r') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.split('#')[0].strip()
+                if not line:
+                    continue
+                try:
+                    print(run_query(tree, line))
+                except ValueError as error:
+                    parser.error(f"{args.queries} line {line_num}: {error}")
+        if args.save:
+            tree.save(args.index)
+            print(f"Updated index saved to '{args.index}'")
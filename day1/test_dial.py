@@ -0,0 +1,533 @@
+import os
+import random
+
+import numpy as np
+import pytest
+from dial import (parse_movements, iter_movement_chunks, movement_label,
+                  dial_positions, zero_touches, summarize, stream_summary,
+                  dial_transform, compose_transforms, identity_transform,
+                  transform_stats, stream_transform, split_byte_ranges,
+                  range_transform, parallel_transform, compile_movements,
+                  open_cache, load_movements, read_tail, incremental_summary,
+                  follow_summary, count_zero_touches_manual, case_touches,
+                  reference_touches, verify_touches, new_verification,
+                  check_touches)
+import dial
+from dial_index import DialSegmentTree, run_query
+
+
+def reference_run(moves, start):
+    """Straight port of the per-movement loop in the day 1 scripts."""
+    position = start
+    positions = []
+    touches = []
+    for value in moves:
+        if value >= 0:
+            count = (position + value) // 100
+            position = (position + value) % 100
+        else:
+            value = -value
+            if position == 0:
+                count = value // 100
+            elif value >= position:
+                count = 1 + (value - position) // 100
+            else:
+                count = 0
+            position = (position - value) % 100
+        positions.append(position)
+        touches.append(count)
+    return positions, touches
+
+
+def random_moves(seed, count=2000, largest=1000):
+    rng = random.Random(seed)
+    return [rng.choice((1, -1)) * rng.randint(0, largest)
+            for _ in range(count)]
+
+
+def test_parse_movements():
+    """Test parsing R/L lines into signed values."""
+    moves = parse_movements(b"R45\nL42\n\nR0\nL100\n")
+    assert moves.tolist() == [45, -42, 0, -100]
+
+
+def test_parse_empty():
+    """Test parsing an empty log."""
+    assert len(parse_movements(b"\n")) == 0
+
+
+def test_parse_rejects_garbage():
+    """Test that malformed lines are not silently dropped."""
+    with pytest.raises(ValueError):
+        parse_movements(b"R45\nLxx\nR3\n")
+
+
+def test_parse_line_layouts():
+    """Test CRLF, padded and unterminated lines and long movements."""
+    assert parse_movements(b"R45\r\nL42\r\n").tolist() == [45, -42]
+    assert parse_movements(b"\n  R7\t\nL123456789012345678").tolist() == [
+        7, -123456789012345678
+    ]
+    for bad in (b"R\n", b"5\n", b"R4L5\n", b"R 45\n", b"R4-5\n",
+                b"R1234567890123456789\n"):
+        with pytest.raises(ValueError):
+            parse_movements(bad)
+
+
+def test_movement_label_round_trip():
+    """Test formatting signed values back into movement strings."""
+    assert movement_label(45) == "R45"
+    assert movement_label(-120) == "L120"
+
+
+@pytest.mark.parametrize("start", [0, 1, 50, 99])
+def test_matches_reference(start):
+    """Test positions and touches against the per-movement loop."""
+    moves = random_moves(start)
+    # Exact multiples of the dial size are the tricky boundary cases
+    moves += [100, -100, 200, -300, 0, -1, 1]
+    positions, touches = reference_run(moves, start)
+    array = np.array(moves, dtype=np.int64)
+
+    assert dial_positions(array, start).tolist() == positions
+    assert zero_touches(array, start).tolist() == touches
+
+
+def test_summarize():
+    """Test the aggregate statistics used by 1_dial_summary.py."""
+    moves = random_moves(7)
+    positions, touches = reference_run(moves, 50)
+    stats = summarize(np.array(moves, dtype=np.int64), 50)
+
+    assert stats['movements'] == len(moves)
+    assert stats['land_count'] == positions.count(0)
+    assert stats['touch_count'] == sum(touches)
+    assert stats['movements_with_touches'] == sum(t > 0 for t in touches)
+    assert stats['movements_with_multiple_touches'] == sum(
+        t > 1 for t in touches
+    )
+    assert stats['max_touches'] == max(touches)
+    assert stats['end_position'] == positions[-1]
+
+
+def test_summarize_empty():
+    """Test statistics for an empty movement list."""
+    stats = summarize(np.zeros(0, dtype=np.int64), 50)
+    assert stats['touch_count'] == 0
+    assert stats['end_position'] == 50
+
+
+def write_log(path, moves):
+    path.write_text(''.join(f"{movement_label(v)}\n" for v in moves))
+    return str(path)
+
+
+def test_iter_movement_chunks(tmp_path):
+    """Test that chunking never splits a movement."""
+    moves = random_moves(3, count=500)
+    filename = write_log(tmp_path / "log.csv", moves)
+    chunks = list(iter_movement_chunks(filename, chunk_bytes=17))
+
+    assert len(chunks) > 1
+    assert np.concatenate(chunks).tolist() == moves
+
+
+def test_iter_movement_chunks_without_trailing_newline(tmp_path):
+    """Test that a final line without a newline is still read."""
+    path = tmp_path / "log.csv"
+    path.write_text("R5\nL10")
+    chunks = list(iter_movement_chunks(str(path), chunk_bytes=4))
+    assert np.concatenate(chunks).tolist() == [5, -10]
+
+
+def test_stream_summary_matches_summarize(tmp_path):
+    """Test that streaming over small chunks gives the same counters."""
+    moves = random_moves(11)
+    filename = write_log(tmp_path / "log.csv", moves)
+    expected = summarize(np.array(moves, dtype=np.int64), 50)
+    stats = stream_summary(iter_movement_chunks(filename, chunk_bytes=64))
+
+    for key, value in expected.items():
+        assert stats[key] == value
+
+
+def test_stream_summary_details(tmp_path):
+    """Test the bounded first-N and top-N movement details."""
+    moves = random_moves(5)
+    positions, touches = reference_run(moves, 50)
+    filename = write_log(tmp_path / "log.csv", moves)
+    stats = stream_summary(iter_movement_chunks(filename, chunk_bytes=50),
+                           top_n=5)
+
+    multi = [i for i, t in enumerate(touches) if t > 1][:5]
+    assert [d['movement_num'] for d in stats['first_multi_touch']] == [
+        i + 1 for i in multi
+    ]
+    first = stats['first_multi_touch'][0]
+    assert first['movement'] == movement_label(moves[multi[0]])
+    assert first['to'] == positions[multi[0]]
+
+    ranked = sorted(range(len(moves)), key=lambda i: (-touches[i], i))[:5]
+    assert [d['movement_num'] for d in stats['top_touches']] == [
+        i + 1 for i in ranked
+    ]
+
+
+def test_stream_summary_top_ties_ignore_chunking():
+    """Test that tied top movements are the earliest in any chunking."""
+    moves = random_moves(8, count=5000, largest=300)
+    _, touches = reference_run(moves, 50)
+    ranked = sorted(range(len(moves)), key=lambda i: (-touches[i], i))[:10]
+
+    for size in (len(moves), 7, 1000):
+        chunks = [np.array(moves[i:i + size])
+                  for i in range(0, len(moves), size)]
+        stats = stream_summary(chunks, 50, top_n=10)
+        assert [d['movement_num'] for d in stats['top_touches']] == [
+            i + 1 for i in ranked
+        ]
+
+
+def test_dial_transform_every_start():
+    """Test that one transform answers for all 100 start positions."""
+    moves = np.array(random_moves(13, count=300) + [100, -200, 0],
+                     dtype=np.int64)
+    transform = dial_transform(moves)
+    for start in range(100):
+        assert transform_stats(transform, start) == summarize(moves, start)
+
+
+def test_compose_transforms_matches_concatenation():
+    """Test that composing chunk transforms equals one big transform."""
+    moves = np.array(random_moves(17, count=900), dtype=np.int64)
+    composed = identity_transform()
+    for chunk in np.array_split(moves, 7):
+        composed = compose_transforms(composed, dial_transform(chunk))
+    whole = dial_transform(moves)
+
+    assert composed['offset'] == whole['offset']
+    for key in ('land', 'touch', 'touched', 'multi', 'peak'):
+        assert composed[key].tolist() == whole[key].tolist()
+
+
+def test_split_byte_ranges(tmp_path):
+    """Test that byte ranges cover the file and end on newlines."""
+    moves = random_moves(19, count=200)
+    filename = write_log(tmp_path / "log.csv", moves)
+    data = open(filename, 'rb').read()
+    ranges = split_byte_ranges(filename, 6)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (begin, _) in zip(ranges, ranges[1:]):
+        assert end == begin and data[end - 1:end] == b'\n'
+
+
+def test_range_transform(tmp_path):
+    """Test the per-worker transform of one byte range."""
+    moves = random_moves(23, count=300)
+    filename = write_log(tmp_path / "log.csv", moves)
+    begin, end = split_byte_ranges(filename, 3)[1]
+    data = open(filename, 'rb').read()
+    expected = dial_transform(parse_movements(data[begin:end]))
+    transform = range_transform((filename, begin, end))
+
+    assert transform['movements'] == expected['movements']
+    assert transform['touch'].tolist() == expected['touch'].tolist()
+
+
+def test_parallel_transform(tmp_path):
+    """Test that the process pool gives bit-exact serial results."""
+    moves = random_moves(29)
+    filename = write_log(tmp_path / "log.csv", moves)
+    expected = summarize(np.array(moves, dtype=np.int64), 50)
+    transform = parallel_transform(filename, num_workers=2)
+
+    assert transform_stats(transform, 50) == expected
+
+
+def test_stream_transform_all_starts(tmp_path):
+    """Test the one-pass table for every start position."""
+    moves = random_moves(31, count=400)
+    filename = write_log(tmp_path / "log.csv", moves)
+    transform = stream_transform(iter_movement_chunks(filename,
+                                                      chunk_bytes=40))
+    array = np.array(moves, dtype=np.int64)
+    for start in range(100):
+        positions, touches = reference_run(moves, start)
+        stats = transform_stats(transform, start)
+        assert stats['land_count'] == positions.count(0)
+        assert stats['touch_count'] == sum(touches)
+        assert stats == summarize(array, start)
+
+
+def reference_range(moves, first, last, start=50):
+    """Lands and touches of movements first..last from the real run."""
+    positions, touches = reference_run(moves, start)
+    return (positions[first - 1:last].count(0),
+            sum(touches[first - 1:last]))
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 16])
+def test_segment_tree_range_queries(block_size):
+    """Test range queries against slices of the reference run."""
+    moves = random_moves(37, count=150)
+    tree = DialSegmentTree(np.array(moves), block_size)
+    rng = random.Random(block_size)
+    for _ in range(100):
+        first = rng.randint(1, len(moves))
+        last = rng.randint(first, len(moves))
+        result = tree.range_query(first, last)
+        assert (result['land_count'], result['touch_count']) == \
+            reference_range(moves, first, last)
+
+
+def test_segment_tree_explicit_entry():
+    """Test a range query from a chosen entry position."""
+    moves = random_moves(41, count=60)
+    tree = DialSegmentTree(np.array(moves), 4)
+    positions, touches = reference_run(moves[9:30], 0)
+    result = tree.range_query(10, 30, entry=0)
+
+    assert result['touch_count'] == sum(touches)
+    assert result['land_count'] == positions.count(0)
+    assert result['exit_position'] == positions[-1]
+
+
+def test_segment_tree_update():
+    """Test that point updates change later answers."""
+    moves = random_moves(43, count=120)
+    tree = DialSegmentTree(np.array(moves), 8)
+    for index, value in ((1, 250), (60, -199), (120, 0), (33, 100)):
+        tree.update(index, value)
+        moves[index - 1] = value
+        assert tree.total()['touch_count'] == sum(reference_run(moves,
+                                                                50)[1])
+        assert (tree.range_query(20, 90)['touch_count']
+                == reference_range(moves, 20, 90)[1])
+
+
+def test_segment_tree_save_load(tmp_path):
+    """Test that a saved index answers without being rebuilt."""
+    moves = random_moves(47, count=80)
+    tree = DialSegmentTree(np.array(moves), 5)
+    filename = str(tmp_path / "index.npz")
+    tree.save(filename)
+    loaded = DialSegmentTree.load(filename)
+
+    assert loaded.range_query(7, 66) == tree.range_query(7, 66)
+    loaded.update(7, -321)
+    tree.update(7, -321)
+    assert loaded.total() == tree.total()
+
+
+def test_run_query_commands():
+    """Test the query-file commands used by the CLI."""
+    moves = [-50, 100, 30]
+    tree = DialSegmentTree(np.array(moves), 2)
+
+    assert run_query(tree, "total") == "total from 50: landed 2, touched 2"
+    assert run_query(tree, "range 2 3") == (
+        "range 2..3 from 0 to 30: landed 1, touched 1"
+    )
+    assert run_query(tree, "set 3 L30") == "set 3: R30 -> L30"
+    with pytest.raises(ValueError):
+        run_query(tree, "frobnicate 1")
+
+
+@pytest.mark.parametrize('index', [0, -1, 4])
+def test_segment_tree_update_out_of_range(index):
+    """Test that an index outside 1..len(moves) is rejected untouched."""
+    tree = DialSegmentTree(np.array([-50, 100, 30]), 2)
+    before = tree.total()
+    with pytest.raises(ValueError):
+        tree.update(index, 5)
+    with pytest.raises(ValueError):
+        run_query(tree, f"set {index} R5")
+    assert tree.moves.tolist() == [-50, 100, 30]
+    assert tree.total() == before
+
+
+@pytest.mark.parametrize('query', ["range 0 2", "range 2 4", "range 3 2",
+                                   "range 1 3 -1", "range 1 3 150",
+                                   "total 100", "set 3", "range 1",
+                                   "total 1 2"])
+def test_run_query_rejects_bad_arguments(query):
+    """Test that bad bounds, entries and argument counts are refused."""
+    tree = DialSegmentTree(np.array([-50, 100, 30]), 2)
+    with pytest.raises(ValueError):
+        run_query(tree, query)
+
+
+def test_compile_and_open_cache(tmp_path):
+    """Test that the binary cache round-trips the movements."""
+    moves = random_moves(53, count=300)
+    filename = write_log(tmp_path / "log.csv", moves)
+    assert open_cache(filename) is None
+
+    cache = compile_movements(filename)
+    cached = open_cache(filename)
+    assert os.path.exists(cache)
+    assert isinstance(cached, np.memmap)
+    assert cached.tolist() == moves
+    assert load_movements(filename) is not None
+    assert load_movements(filename).tolist() == moves
+
+
+def test_cache_detects_changed_content(tmp_path):
+    """Test that a cache is ignored once the log changes."""
+    path = tmp_path / "log.csv"
+    path.write_text("R10\nL20\n")
+    compile_movements(str(path))
+    path.write_text("R11\nL21\n")
+    os.utime(path, ns=(0, 0))
+
+    assert open_cache(str(path)) is None
+    assert load_movements(str(path)).tolist() == [11, -21]
+
+
+def test_cache_survives_touch(tmp_path):
+    """Test that a new mtime with the same content keeps the cache."""
+    moves = random_moves(59, count=50)
+    filename = write_log(tmp_path / "log.csv", moves)
+    compile_movements(filename)
+    os.utime(filename, ns=(0, 0))
+
+    assert open_cache(filename).tolist() == moves
+
+
+def test_cached_chunks_and_parallel(tmp_path):
+    """Test the streaming and parallel paths on top of the cache."""
+    moves = random_moves(61)
+    filename = write_log(tmp_path / "log.csv", moves)
+    expected = summarize(np.array(moves, dtype=np.int64), 50)
+    compile_movements(filename)
+
+    chunks = list(iter_movement_chunks(filename, chunk_bytes=256))
+    assert len(chunks) > 1
+    assert all(isinstance(chunk, np.memmap) for chunk in chunks)
+    stats = stream_summary(iter_movement_chunks(filename, chunk_bytes=256))
+    for key, value in expected.items():
+        assert stats[key] == value
+    assert transform_stats(parallel_transform(filename, 2), 50) == expected
+
+
+def expected_stats(moves, start=50):
+    return summarize(np.array(moves, dtype=np.int64), start)
+
+
+def test_read_tail_leaves_partial_line(tmp_path):
+    """Test that an unterminated last line waits for its newline."""
+    path = tmp_path / "log.csv"
+    path.write_text("R5\nL10\nR3")
+    parts = list(read_tail(str(path), 3))
+
+    assert [moves.tolist() for moves, _ in parts] == [[-10]]
+    assert parts[-1][1] == len("R5\nL10\n")
+
+
+def test_incremental_summary_appends(tmp_path):
+    """Test that each run only folds in the appended movements."""
+    moves = random_moves(67, count=600)
+    path = tmp_path / "log.csv"
+    checkpoint = str(tmp_path / "checkpoint.json")
+    write_log(path, moves[:250])
+    assert incremental_summary(str(path), checkpoint) == \
+        expected_stats(moves[:250])
+
+    with open(path, 'a') as f:
+        f.write(''.join(f"{movement_label(v)}\n" for v in moves[250:]))
+    assert incremental_summary(str(path), checkpoint) == \
+        expected_stats(moves)
+    assert incremental_summary(str(path), checkpoint) == \
+        expected_stats(moves)
+
+
+def test_incremental_summary_counts_unterminated_line(tmp_path):
+    """Test that a one-shot run counts the last line without a newline."""
+    path = tmp_path / "log.csv"
+    checkpoint = str(tmp_path / "checkpoint.json")
+    path.write_text("R50\nL20\nR70")
+    assert incremental_summary(str(path), checkpoint) == \
+        expected_stats([50, -20, 70])
+
+    # The line is only checkpointed once its newline arrives
+    with open(path, 'a') as f:
+        f.write("5\nL3\n")
+    assert incremental_summary(str(path), checkpoint) == \
+        expected_stats([50, -20, 705, -3])
+
+
+def test_incremental_summary_rewritten_log(tmp_path):
+    """Test that a log that shrank is read again from the start."""
+    path = tmp_path / "log.csv"
+    checkpoint = str(tmp_path / "checkpoint.json")
+    write_log(path, random_moves(71, count=100))
+    incremental_summary(str(path), checkpoint)
+
+    moves = random_moves(73, count=20)
+    write_log(path, moves)
+    assert incremental_summary(str(path), checkpoint) == \
+        expected_stats(moves)
+
+
+def test_follow_summary(tmp_path):
+    """Test that following yields a new summary after each append."""
+    moves = random_moves(79, count=40)
+    path = tmp_path / "log.csv"
+    write_log(path, moves[:10])
+    updates = follow_summary(str(path), interval=0)
+
+    assert next(updates) == expected_stats(moves[:10])
+    with open(path, 'a') as f:
+        f.write(''.join(f"{movement_label(v)}\n" for v in moves[10:]))
+    assert next(updates) == expected_stats(moves)
+
+
+def test_touch_formulas_exhaustive():
+    """Test both closed forms against stepping for small movements."""
+    before, values = np.meshgrid(np.arange(100), np.arange(-350, 351))
+    before, moves = before.ravel(), values.ravel()
+    manual = [count_zero_touches_manual(int(p), 'R' if v >= 0 else 'L',
+                                        abs(int(v)))[0]
+              for p, v in zip(before, moves)]
+
+    assert case_touches(before, moves).tolist() == manual
+    assert reference_touches(before, moves).tolist() == manual
+
+
+def test_verify_touches_clean_log(tmp_path):
+    """Test a full-file verification with no mismatches."""
+    moves = random_moves(83)
+    filename = write_log(tmp_path / "log.csv", moves)
+    result = verify_touches(iter_movement_chunks(filename, chunk_bytes=99),
+                            samples=500)
+
+    assert result['checked'] == len(moves)
+    assert result['sampled'] == 500
+    assert result['stepped'] > 0
+    assert result['mismatches'] == []
+
+
+def test_check_touches_shares_the_summary_pass():
+    """Test that checking chunks passes them through to a summary."""
+    moves = random_moves(53)
+    chunks = [np.array(moves[:70]), np.array(moves[70:])]
+    result = new_verification()
+    stats = stream_summary(check_touches(iter(chunks), result, 50), 50)
+
+    assert stats == stream_summary(chunks, 50)
+    assert result['checked'] == len(moves)
+    assert result['mismatches'] == []
+
+
+def test_verify_touches_reports_mismatch(monkeypatch):
+    """Test that a broken engine formula is caught."""
+    def off_by_one(moves, start=50):
+        return np.abs(moves) // 100
+
+    monkeypatch.setattr(dial, 'zero_touches', off_by_one)
+    result = verify_touches([np.array([60, -20, 5])], samples=0)
+
+    assert result['mismatches'][0]['movement_num'] == 1
+    assert result['mismatches'][0]['engine'] == 0
+    assert result['mismatches'][0]['reference'] == 1
@@ -1,54 +1,48 @@
-def has_repeating_sequence(num):
-    """Check if a number is exactly two identical halves"""
-    s = str(num)
-    length = len(s)
-
-    # The number must have even length to split in half
-    if length % 2 != 0:
-        return False
-
-    # Split in half and check if both halves are equal
-    mid = length // 2
-    first_half = s[:mid]
-    second_half = s[mid:]
-
-    # Pattern cannot have a leading zero
-    if first_half[0] == '0':
-        return False
-
-    return first_half == second_half
-
-
-# Read the file
-with open('2.csv', 'r') as f:
-    content = f.read().strip()
-
-# Parse the ranges
-ranges = content.split(',')
-
-total_invalid = 0
-all_invalid_numbers = []
-
-for range_str in ranges:
-    start, end = map(int, range_str.split('-'))
-
-    # Find invalid numbers in this range
-    invalid_numbers = []
-    for num in range(start, end + 1):
-        if has_repeating_sequence(num):
-            invalid_numbers.append(num)
-
-    if invalid_numbers:
-        print(f"\nRange {range_str}:")
-        print(f"  Invalid numbers: {invalid_numbers}")
-        print(f"  Count: {len(invalid_numbers)}")
-
-    all_invalid_numbers.extend(invalid_numbers)
-    total_invalid += len(invalid_numbers)
-
-print(f"\n{'='*60}")
-print(f"Total invalid numbers across all ranges: {total_invalid}")
-print("\nAll invalid numbers:")
-print(all_invalid_numbers)
-print(f"\n{'='*60}")
-print(f"Sum of all invalid numbers: {sum(all_invalid_numbers)}")
+import sys
+from itertools import chain
+
+from aggregate import InvalidIdAggregator, print_list
+from invalid_ids import (load_ranges, count_doubled_ids, iter_doubled_ids,
+                         doubled_mask)
+from scanner import merge_partials, scan_ranges
+
+if __name__ == "__main__":
+    # Read the ranges, merged and split into single digit lengths
+    ranges = load_ranges('2.csv')
+
+    # Only running totals are kept, the IDs themselves are generated on the
+    # fly while printing
+    totals = InvalidIdAggregator(top_k=0)
+
+    for start, end in ranges:
+        # Count and sum come from arithmetic series over the half patterns,
+        # the listing generates pattern * (10^k + 1) directly
+        count, subtotal = count_doubled_ids(start, end)
+        totals.add_stats(count, subtotal)
+
+        if count:
+            print(f"\nRange {start}-{end}:")
+            print_list(iter_doubled_ids(start, end), "  Invalid numbers: ")
+            print(f"  Count: {count}")
+
+    total_invalid = totals.count
+    total_sum = totals.sum
+
+    print(f"\n{'='*60}")
+    print(f"Total invalid numbers across all ranges: {total_invalid}")
+    print("\nAll invalid numbers:")
+    print_list(chain.from_iterable(iter_doubled_ids(start, end)
+                                   for start, end in ranges))
+    print(f"\n{'='*60}")
+    print(f"Sum of all invalid numbers: {total_sum}")
+
+    # Optionally cross-check the closed form against a vectorized brute-force
+    # scan of every ID in the ranges
+    if '--check' in sys.argv[1:]:
+        scanned = merge_partials(
+            scan_ranges(ranges, doubled_mask, vectorized=True)
+        )
+        status = ("OK" if (scanned['count'], scanned['sum'])
+                  == (total_invalid, total_sum) else "MISMATCH")
+        print(f"Brute-force check: {scanned['count']} IDs, "
+              f"sum {scanned['sum']} - {status}")
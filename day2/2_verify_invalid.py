@@ -1,3 +1,8 @@
+from invalid_ids import load_ranges, repeated_mask
+from aggregate import InvalidIdAggregator
+from scanner import scan_ranges
+
+
 def has_repeating_sequence(num):
     """Check if a number has repeating sequences of digits"""
     s = str(num)
@@ -14,37 +19,33 @@ def has_repeating_sequence(num):
     return False, None
 
 
-# Check some of the large numbers
-test_numbers = [6666666666, 3687536875, 628628628, 42424242, 59595959]
-
-print("Verifying large invalid numbers:")
-for num in test_numbers:
-    result, pattern = has_repeating_sequence(num)
-    if result:
-        repeated = pattern * (len(str(num)) // len(pattern))
-        print(f"{num}: repeating pattern '{pattern}' -> {repeated}")
-    else:
-        print(f"{num}: NOT repeating")
-
-# What's the contribution of the top 10 largest numbers?
-with open('2.csv', 'r') as f:
-    content = f.read().strip()
+if __name__ == "__main__":
+    # Check some of the large numbers
+    test_numbers = [6666666666, 3687536875, 628628628, 42424242, 59595959]
 
-ranges = content.split(',')
-all_invalid = []
-
-for range_str in ranges:
-    start, end = map(int, range_str.split('-'))
-    for num in range(start, end + 1):
-        result, _ = has_repeating_sequence(num)
+    print("Verifying large invalid numbers:")
+    for num in test_numbers:
+        result, pattern = has_repeating_sequence(num)
         if result:
-            all_invalid.append(num)
-
-all_invalid.sort(reverse=True)
-print("\nTop 10 largest invalid numbers:")
-for i, num in enumerate(all_invalid[:10], 1):
-    print(f"{i}. {num}")
-
-print(f"\nSum of top 10: {sum(all_invalid[:10])}")
-print(f"Total sum: {sum(all_invalid)}")
-print(f"Total count: {len(all_invalid)}")
+            repeated = pattern * (len(str(num)) // len(pattern))
+            print(f"{num}: repeating pattern '{pattern}' -> {repeated}")
+        else:
+            print(f"{num}: NOT repeating")
+
+    # What's the contribution of the top 10 largest numbers?
+    # Ranges are merged first so no number is scanned twice, and the
+    # brute-force scan tests whole uint64 blocks across a process pool.
+    # Chunk results stream into running totals and a 10-element heap.
+    totals = InvalidIdAggregator(top_k=10)
+    for partial in scan_ranges(load_ranges('2.csv'), repeated_mask,
+                               top_k=10, vectorized=True):
+        totals.merge(partial)
+    top = totals.top()
+
+    print("\nTop 10 largest invalid numbers:")
+    for i, num in enumerate(top, 1):
+        print(f"{i}. {num}")
+
+    print(f"\nSum of top 10: {sum(top)}")
+    print(f"Total sum: {totals.sum}")
+    print(f"Total count: {totals.count}")
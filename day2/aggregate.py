@@ -0,0 +1,87 @@
+"""
+Streaming aggregation and printing of day 2 invalid IDs.
+
+Reports only ever need a count, a sum, the k largest IDs and perhaps a
+per-range breakdown, so IDs are folded into running totals and a bounded
+min-heap as they arrive instead of being collected into one list. Long
+listings are written element by element in the same format print() gives
+a list.
+"""
+import heapq
+import sys
+from typing import Dict, Hashable, Iterable, Iterator, List, TextIO
+
+
+class InvalidIdAggregator:
+    """Running count, sum, top-k and optional per-range histogram."""
+
+    def __init__(self, top_k: int = 10, per_range: bool = False):
+        self.top_k = top_k
+        self.per_range = per_range
+        self.count = 0
+        self.sum = 0
+        self.ranges: Dict[Hashable, List[int]] = {}
+        self._heap: List[int] = []
+
+    def _offer(self, num: int):
+        """Keep num if it is among the top_k largest seen so far."""
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, num)
+        elif self.top_k and num > self._heap[0]:
+            heapq.heapreplace(self._heap, num)
+
+    def add_stats(self, count: int, total: int, top: Iterable[int] = (),
+                  key: Hashable = None):
+        """
+        Fold in pre-aggregated results, such as closed-form counts or a
+        scanner partial, along with the largest IDs behind them.
+        """
+        self.count += count
+        self.sum += total
+        for num in top:
+            self._offer(num)
+        if self.per_range and key is not None:
+            tally = self.ranges.setdefault(key, [0, 0])
+            tally[0] += count
+            tally[1] += total
+
+    def add(self, num: int, key: Hashable = None):
+        """Fold in a single invalid ID."""
+        self.add_stats(1, num, (num,), key)
+
+    def merge(self, partial: Dict):
+        """
+        Fold in a scanner partial, keyed by the input range it came from
+        so that chunks of one wide range share a histogram entry.
+        """
+        self.add_stats(partial['count'], partial['sum'], partial['top'],
+                       partial['range'])
+
+    def track(self, nums: Iterable[int], key: Hashable = None
+              ) -> Iterator[int]:
+        """Pass IDs through unchanged while folding each one in."""
+        for num in nums:
+            self.add(num, key)
+            yield num
+
+    def top(self) -> List[int]:
+        """The largest IDs seen, in decreasing order."""
+        return sorted(self._heap, reverse=True)
+
+    def result(self) -> Dict:
+        """Totals so far as a dict."""
+        result = {'count': self.count, 'sum': self.sum, 'top': self.top()}
+        if self.per_range:
+            result['ranges'] = {key: tuple(tally)
+                                for key, tally in self.ranges.items()}
+        return result
+
+
+def print_list(items: Iterable[int], prefix: str = '',
+               file: TextIO = None):
+    """Print items like print(list(items)) without building the list."""
+    file = file or sys.stdout
+    file.write(prefix + '[')
+    for i, item in enumerate(items):
+        file.write(f", {item!r}" if i else repr(item))
+    file.write(']\n')
@@ -0,0 +1,249 @@
+"""
+Arithmetic enumeration of the day 2 invalid IDs.
+
+An ID made of two identical k-digit halves is h * (10^k + 1) for a k-digit
+pattern h, so the invalid IDs inside a range form an arithmetic series
+whose bounds come straight from the range endpoints. The work per range
+depends on the number of digit lengths it spans, not on its width.
+
+IDs made of any number of repeats work the same way: an L-digit ID with
+period p is h * (10^L - 1) / (10^p - 1). IDs with several periods (like
+111111) are counted once by Mobius inversion over the divisors of L.
+
+For brute-force scans the same identity gives vectorized predicates: an
+L-digit n has period p exactly when (n % 10^p) * repunit == n, which is
+checked for a whole uint64 block at once without building strings.
+"""
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+MAX_MASK_DIGITS = 19
+POWERS_OF_TEN = np.array([10 ** d for d in range(MAX_MASK_DIGITS + 1)],
+                         dtype=np.uint64)
+
+
+def has_doubled_halves(num: int) -> bool:
+    """Check if a number is exactly two identical halves"""
+    s = str(num)
+    mid, odd = divmod(len(s), 2)
+    return not odd and s[0] != '0' and s[:mid] == s[mid:]
+
+
+def has_repeated_pattern(num: int) -> bool:
+    """Check if a number is some pattern repeated at least twice"""
+    s = str(num)
+    length = len(s)
+    return s[0] != '0' and any(
+        s[:p] * (length // p) == s
+        for p in range(1, length // 2 + 1) if length % p == 0
+    )
+
+
+def parse_ranges(content: str) -> List[Tuple[int, int]]:
+    """Parse comma-separated 'start-end' ranges."""
+    return [tuple(map(int, range_str.split('-')))
+            for range_str in content.strip().split(',') if range_str]
+
+
+def merge_ranges(ranges: Iterable[Tuple[int, int]]
+                 ) -> List[Tuple[int, int]]:
+    """Sort ranges and merge the ones that overlap or touch."""
+    merged = []
+    for start, end in sorted(r for r in ranges if r[0] <= r[1]):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def split_digit_lengths(ranges: Iterable[Tuple[int, int]]
+                        ) -> List[Tuple[int, int]]:
+    """Split ranges so every piece holds numbers of one digit length."""
+    pieces = []
+    for start, end in ranges:
+        while start <= end:
+            boundary = 10 ** len(str(max(start, 1))) - 1
+            pieces.append((start, min(end, boundary)))
+            start = boundary + 1
+    return pieces
+
+
+def load_ranges(filename: str) -> List[Tuple[int, int]]:
+    """
+    Read the ranges of a day 2 input as sorted, disjoint pieces that each
+    hold a single digit length, so no ID is scanned or counted twice.
+    """
+    with open(filename, 'r') as f:
+        return split_digit_lengths(merge_ranges(parse_ranges(f.read())))
+
+
+def digit_lengths(start: int, end: int) -> range:
+    """Digit lengths of the numbers in [start, end]."""
+    if end < start:
+        return range(0)
+    return range(len(str(max(start, 1))), len(str(end)) + 1)
+
+
+def pattern_bounds(start: int, end: int, digits: int,
+                   multiplier: int) -> Tuple[int, int]:
+    """
+    Smallest and largest `digits`-digit patterns h with
+    start <= h * multiplier <= end (empty when the first exceeds the
+    second).
+    """
+    low = max(10 ** (digits - 1), -(-start // multiplier))
+    high = min(10 ** digits - 1, end // multiplier)
+    return low, high
+
+
+def series_stats(low: int, high: int, multiplier: int) -> Tuple[int, int]:
+    """Count and sum of h * multiplier for h in [low, high]."""
+    if high < low:
+        return 0, 0
+    count = high - low + 1
+    return count, multiplier * (low + high) * count // 2
+
+
+def count_doubled_ids(start: int, end: int) -> Tuple[int, int]:
+    """Count and sum of the two-identical-halves IDs in [start, end]."""
+    count = total = 0
+    for length in digit_lengths(start, end):
+        if length % 2:
+            continue
+        half = length // 2
+        multiplier = 10 ** half + 1
+        n, s = series_stats(*pattern_bounds(start, end, half, multiplier),
+                            multiplier)
+        count += n
+        total += s
+    return count, total
+
+
+def iter_doubled_ids(start: int, end: int) -> Iterator[int]:
+    """Yield the two-identical-halves IDs in [start, end] in order."""
+    for length in digit_lengths(start, end):
+        if length % 2:
+            continue
+        half = length // 2
+        multiplier = 10 ** half + 1
+        low, high = pattern_bounds(start, end, half, multiplier)
+        for pattern in range(low, high + 1):
+            yield pattern * multiplier
+
+
+@lru_cache(maxsize=None)
+def divisors(n: int) -> List[int]:
+    """Divisors of n in increasing order."""
+    return [d for d in range(1, n + 1) if n % d == 0]
+
+
+@lru_cache(maxsize=None)
+def mobius(n: int) -> int:
+    """Mobius function of n."""
+    result = 1
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            n //= p
+            if n % p == 0:
+                return 0
+            result = -result
+        p += 1
+    return -result if n > 1 else result
+
+
+def repunit_multiplier(length: int, period: int) -> int:
+    """Multiplier that repeats a `period`-digit pattern to `length` digits."""
+    return (10 ** length - 1) // (10 ** period - 1)
+
+
+@lru_cache(maxsize=None)
+def _period_weights(length: int) -> List[Tuple[int, int]]:
+    """
+    (period, weight) pairs such that summing weight * (IDs whose period
+    divides `period`) counts every repeated `length`-digit ID once.
+
+    The IDs whose smallest period is exactly d are
+    sum over e | d of mobius(d / e) * (IDs whose period divides e),
+    and the repeated IDs are those with a smallest period d < length.
+    """
+    proper = [d for d in divisors(length) if d < length]
+    weights = {}
+    for d in proper:
+        for e in divisors(d):
+            weights[e] = weights.get(e, 0) + mobius(d // e)
+    return [(e, w) for e, w in sorted(weights.items()) if w]
+
+
+def count_repeated_ids(start: int, end: int) -> Tuple[int, int]:
+    """Count and sum of the repeated-pattern IDs in [start, end]."""
+    count = total = 0
+    for length in digit_lengths(start, end):
+        for period, weight in _period_weights(length):
+            multiplier = repunit_multiplier(length, period)
+            n, s = series_stats(
+                *pattern_bounds(start, end, period, multiplier), multiplier
+            )
+            count += weight * n
+            total += weight * s
+    return count, total
+
+
+def iter_repeated_ids(start: int, end: int) -> Iterator[int]:
+    """Yield the repeated-pattern IDs in [start, end] in order."""
+    for length in digit_lengths(start, end):
+        # Every repeated ID has a period length / p for some prime p
+        periods = [length // p for p in divisors(length)[1:]
+                   if mobius(p) == -1]
+        found = set()
+        for period in periods:
+            multiplier = repunit_multiplier(length, period)
+            low, high = pattern_bounds(start, end, period, multiplier)
+            found.update(h * multiplier for h in range(low, high + 1))
+        yield from sorted(found)
+
+
+def _maximal_periods(length: int, kind: str) -> List[int]:
+    """Periods whose multiples cover every `kind` ID of `length` digits."""
+    if kind == 'doubled':
+        return [] if length % 2 else [length // 2]
+    if kind == 'repeated':
+        return [length // p for p in divisors(length)[1:]
+                if mobius(p) == -1]
+    raise ValueError(f"Unknown kind: {kind}")
+
+
+def period_mask(values: np.ndarray, kind: str = 'repeated') -> np.ndarray:
+    """
+    Boolean mask of the `kind` ('doubled' or 'repeated') IDs in a block
+    of positive IDs below 10^19, using only uint64 arithmetic.
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    mask = np.zeros(len(values), dtype=bool)
+    lengths = np.searchsorted(POWERS_OF_TEN, values, side='right')
+    for length in np.unique(lengths).tolist():
+        periods = _maximal_periods(length, kind)
+        if not periods:
+            continue
+        # Blocks from a scan are sorted, but masking keeps any order valid
+        rows = np.flatnonzero(lengths == length)
+        block = values[rows]
+        hits = np.zeros(len(block), dtype=bool)
+        for period in periods:
+            multiplier = np.uint64(repunit_multiplier(length, period))
+            hits |= block % POWERS_OF_TEN[period] * multiplier == block
+        mask[rows] = hits
+    return mask
+
+
+def doubled_mask(values: np.ndarray) -> np.ndarray:
+    """Vectorized has_doubled_halves over a block of IDs."""
+    return period_mask(values, 'doubled')
+
+
+def repeated_mask(values: np.ndarray) -> np.ndarray:
+    """Vectorized has_repeated_pattern over a block of IDs."""
+    return period_mask(values, 'repeated')
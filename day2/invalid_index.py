@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Precomputed sorted index of every invalid ID up to a digit limit.
+
+The IDs are written once, in increasing order, to a uint64 .npy file,
+with a prefix-sum array and a small JSON file recording the kind of ID
+and the digit limit next to it. The two arrays are memory-mapped on
+load, so the count, sum and largest IDs of any range list come from
+binary search in O(log n) per range instead of rescanning the ranges.
+
+Usage:
+    python invalid_index.py build [prefix] [--max-digits 12] [--kind K]
+    python invalid_index.py query prefix ranges.csv [more.csv ...] [--top 10]
+"""
+import argparse
+import heapq
+import json
+import os
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from invalid_ids import (count_doubled_ids, count_repeated_ids, divisors,
+                         mobius, repunit_multiplier, load_ranges)
+
+DEFAULT_PREFIX = 'invalid_ids'
+MAX_DIGITS = 12
+KINDS = {
+    'doubled': count_doubled_ids,
+    'repeated': count_repeated_ids,
+}
+
+
+def _length_ids(length: int, kind: str) -> np.ndarray:
+    """Sorted invalid IDs with exactly `length` digits."""
+    if kind == 'doubled':
+        periods = [length // 2] if length % 2 == 0 else []
+    else:
+        periods = [length // p for p in divisors(length)[1:]
+                   if mobius(p) == -1]
+    blocks = [
+        np.arange(10 ** (period - 1), 10 ** period, dtype=np.uint64)
+        * np.uint64(repunit_multiplier(length, period))
+        for period in periods
+    ]
+    if not blocks:
+        return np.zeros(0, dtype=np.uint64)
+    return np.unique(np.concatenate(blocks))
+
+
+def index_paths(prefix: str) -> Tuple[str, str, str]:
+    """Files holding the sorted IDs, their prefix sums and the metadata."""
+    return f"{prefix}.ids.npy", f"{prefix}.prefix.npy", f"{prefix}.meta.json"
+
+
+def build_index(prefix: str = DEFAULT_PREFIX, max_digits: int = MAX_DIGITS,
+                kind: str = 'repeated') -> int:
+    """
+    Write every invalid ID of up to `max_digits` digits and their prefix
+    sums, one digit length at a time. Returns the number of IDs.
+    """
+    count, total = KINDS[kind](1, 10 ** max_digits - 1)
+    if total >= 2 ** 64:
+        raise ValueError(f"Sum of {kind} IDs up to {max_digits} digits "
+                         f"does not fit in uint64")
+    ids_path, prefix_path, meta_path = index_paths(prefix)
+    ids = np.lib.format.open_memmap(ids_path, mode='w+', dtype=np.uint64,
+                                    shape=(count,))
+    sums = np.lib.format.open_memmap(prefix_path, mode='w+',
+                                     dtype=np.uint64, shape=(count + 1,))
+    sums[0] = 0
+    filled = 0
+    for length in range(1, max_digits + 1):
+        block = _length_ids(length, kind)
+        ids[filled:filled + len(block)] = block
+        sums[filled + 1:filled + len(block) + 1] = (
+            np.cumsum(block, dtype=np.uint64) + sums[filled]
+        )
+        filled += len(block)
+    ids.flush()
+    sums.flush()
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'kind': kind, 'max_digits': max_digits}, f)
+    return count
+
+
+class InvalidIdIndex:
+    """Memory-mapped sorted invalid IDs with prefix sums."""
+
+    def __init__(self, prefix: str = DEFAULT_PREFIX):
+        ids_path, prefix_path, meta_path = index_paths(prefix)
+        self.ids = np.load(ids_path, mmap_mode='r')
+        self.sums = np.load(prefix_path, mmap_mode='r')
+        # The kind is None for indexes written without metadata
+        self.kind = None
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self.kind = meta['kind']
+            max_digits = meta['max_digits']
+        else:
+            # Indexes written without metadata cover at least every ID
+            # with as many digits as their largest
+            max_digits = len(str(int(self.ids[-1]))) if len(self.ids) else 0
+        self.limit = 10 ** max_digits - 1
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _bounds(self, start: int, end: int) -> Tuple[int, int]:
+        if end > self.limit:
+            raise ValueError(f"Range end {end} is beyond the index "
+                             f"limit {self.limit}")
+        first = int(np.searchsorted(self.ids, np.uint64(max(start, 0)),
+                                    side='left'))
+        last = int(np.searchsorted(self.ids, np.uint64(end), side='right'))
+        return first, max(first, last)
+
+    def range_stats(self, start: int, end: int) -> Tuple[int, int]:
+        """Count and sum of the invalid IDs in [start, end]."""
+        first, last = self._bounds(start, end)
+        return last - first, int(self.sums[last]) - int(self.sums[first])
+
+    def range_ids(self, start: int, end: int) -> np.ndarray:
+        """Zero-copy view of the invalid IDs in [start, end]."""
+        first, last = self._bounds(start, end)
+        return self.ids[first:last]
+
+    def top_k(self, ranges: Iterable[Tuple[int, int]],
+              k: int = 10) -> List[int]:
+        """The k largest invalid IDs over a list of ranges."""
+        tails = (self.range_ids(start, end)[-k:].tolist() if k else []
+                 for start, end in ranges)
+        return heapq.nlargest(k, (num for tail in tails for num in tail))
+
+    def query(self, ranges: List[Tuple[int, int]], k: int = 10) -> dict:
+        """Count, sum and top k of the invalid IDs over a range list."""
+        count = total = 0
+        for start, end in ranges:
+            n, s = self.range_stats(start, end)
+            count += n
+            total += s
+        return {'count': count, 'sum': total, 'top': self.top_k(ranges, k)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sorted index of day 2 invalid IDs"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="generate the index")
+    build.add_argument('prefix', nargs='?', default=DEFAULT_PREFIX)
+    build.add_argument('--max-digits', type=int, default=MAX_DIGITS)
+    build.add_argument('--kind', choices=sorted(KINDS), default='repeated')
+    query = commands.add_parser('query', help="query range lists")
+    query.add_argument('prefix')
+    query.add_argument('files', nargs='+')
+    query.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        count = build_index(args.prefix, args.max_digits, args.kind)
+        print(f"Indexed {count} {args.kind} IDs up to {args.max_digits} "
+              f"digits into '{index_paths(args.prefix)[0]}'")
+    else:
+        index = InvalidIdIndex(args.prefix)
+        print(f"Index '{args.prefix}': {index.kind or 'unrecorded'} IDs "
+              f"up to {index.limit}")
+        for filename in args.files:
+            result = index.query(load_ranges(filename), args.top)
+            print(f"{filename}: count {result['count']}, "
+                  f"sum {result['sum']}")
+            print(f"  Top {args.top}: {result['top']}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Process-pool brute-force scanner for arbitrary day 2 predicates.
+
+Validity rules without a closed form still need every ID tested. The
+ranges are cut into fixed-size chunks that a ProcessPoolExecutor scans
+with a pluggable predicate, and each chunk streams back a partial result
+(count, sum and its largest matches) as soon as it is done.
+
+Predicates are either per-ID (int -> bool) or vectorized (uint64 block ->
+bool mask, see period_mask); vectorized ones test a whole chunk per call.
+Both must be module-level functions so they can be pickled.
+
+Usage:
+    python scanner.py [2.csv] [--predicate repeated] [--workers N] [--per-id]
+"""
+import argparse
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                as_completed, wait)
+from multiprocessing import cpu_count
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from aggregate import InvalidIdAggregator
+from invalid_ids import (doubled_mask, has_doubled_halves,
+                         has_repeated_pattern, load_ranges, repeated_mask)
+
+CHUNK_SIZE = 1_000_000
+PREDICATES = {
+    'doubled': has_doubled_halves,
+    'repeated': has_repeated_pattern,
+}
+MASKS = {
+    'doubled': doubled_mask,
+    'repeated': repeated_mask,
+}
+
+
+def iter_chunks(ranges: Iterable[Tuple[int, int]],
+                chunk_size: int = CHUNK_SIZE
+                ) -> Iterator[Tuple[int, int, Tuple[int, int]]]:
+    """
+    Cut inclusive ranges into inclusive chunks of chunk_size IDs, each
+    with the range it came from.
+    """
+    for start, end in ranges:
+        for chunk_start in range(start, end + 1, chunk_size):
+            yield (chunk_start, min(end, chunk_start + chunk_size - 1),
+                   (start, end))
+
+
+def scan_chunk(args: Tuple[Callable[[int], bool], int, int, int,
+                           Tuple[int, int]]) -> Dict:
+    """
+    Count, sum and top_k largest IDs in [start, end] that match, tagged
+    with the source range of the chunk.
+    """
+    predicate, start, end, top_k, source = args
+    count = total = 0
+    # IDs are visited in increasing order, so the last matches are the top
+    top = deque(maxlen=top_k)
+    for num in range(start, end + 1):
+        if predicate(num):
+            count += 1
+            total += num
+            top.append(num)
+    return {'start': start, 'end': end, 'range': source, 'count': count,
+            'sum': total, 'top': list(reversed(top))}
+
+
+def scan_block(args: Tuple[Callable[[np.ndarray], np.ndarray],
+                           int, int, int, Tuple[int, int]]) -> Dict:
+    """scan_chunk for a vectorized predicate over the uint64 block."""
+    mask, start, end, top_k, source = args
+    values = np.arange(start, end + 1, dtype=np.uint64)
+    matches = values[mask(values)]
+    top = matches[::-1][:top_k] if top_k else matches[:0]
+    return {'start': start, 'end': end, 'range': source,
+            'count': len(matches), 'sum': sum(map(int, matches)),
+            'top': top.tolist()}
+
+
+def scan_ranges(ranges: Iterable[Tuple[int, int]],
+                predicate: Callable,
+                chunk_size: int = CHUNK_SIZE, num_workers: int = None,
+                top_k: int = 10, vectorized: bool = False
+                ) -> Iterator[Dict]:
+    """
+    Yield one partial result per chunk, in completion order. Each
+    partial carries the input range its chunk belongs to as 'range'.
+
+    With vectorized=True the predicate maps a uint64 block to a bool
+    mask. At most a few chunks per worker are in flight at a time, so
+    ranges with billions of IDs do not queue millions of futures.
+    """
+    if num_workers is None:
+        num_workers = cpu_count()
+    worker = scan_block if vectorized else scan_chunk
+    tasks = ((predicate, start, end, top_k, source)
+             for start, end, source in iter_chunks(ranges, chunk_size))
+    if num_workers <= 1:
+        yield from map(worker, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(worker, task))
+            if len(pending) >= 4 * num_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def merge_partials(partials: Iterable[Dict], top_k: int = 10) -> Dict:
+    """Combine chunk partials into a total count, sum and top_k."""
+    aggregator = InvalidIdAggregator(top_k)
+    for partial in partials:
+        aggregator.merge(partial)
+    return aggregator.result()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Parallel brute-force scan of day 2 ranges"
+    )
+    parser.add_argument('filename', nargs='?', default='2.csv')
+    parser.add_argument('--predicate', choices=sorted(PREDICATES),
+                        default='repeated')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--per-id', action='store_true',
+                        help="test IDs one by one instead of in blocks")
+    args = parser.parse_args()
+
+    predicates = PREDICATES if args.per_id else MASKS
+    result = merge_partials(
+        scan_ranges(load_ranges(args.filename), predicates[args.predicate],
+                    args.chunk_size, args.workers, args.top,
+                    vectorized=not args.per_id),
+        args.top,
+    )
+    print(f"Invalid IDs ({args.predicate}): {result['count']}")
+    print(f"Sum: {result['sum']}")
+    print(f"Top {args.top}: {result['top']}")
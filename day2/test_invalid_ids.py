@@ -0,0 +1,354 @@
+import io
+import random
+
+import numpy as np
+import pytest
+from invalid_ids import (has_doubled_halves, has_repeated_pattern,
+                         digit_lengths, count_doubled_ids, iter_doubled_ids,
+                         divisors, mobius, count_repeated_ids,
+                         iter_repeated_ids, parse_ranges, merge_ranges,
+                         split_digit_lengths, load_ranges, doubled_mask,
+                         repeated_mask)
+from aggregate import InvalidIdAggregator, print_list
+from invalid_index import build_index, InvalidIdIndex
+from scanner import (iter_chunks, scan_block, scan_chunk, scan_ranges,
+                     merge_partials)
+
+
+def brute_force(start, end, predicate):
+    found = [num for num in range(start, end + 1) if predicate(num)]
+    return len(found), sum(found), found
+
+
+def test_has_doubled_halves():
+    """Test the string predicate on a few known IDs."""
+    assert has_doubled_halves(11)
+    assert has_doubled_halves(6464)
+    assert has_doubled_halves(123123)
+    assert not has_doubled_halves(111)
+    assert not has_doubled_halves(1213)
+
+
+def test_digit_lengths():
+    """Test the digit lengths spanned by a range."""
+    assert list(digit_lengths(0, 9)) == [1]
+    assert list(digit_lengths(95, 1005)) == [2, 3, 4]
+    assert list(digit_lengths(10, 5)) == []
+
+
+@pytest.mark.parametrize("start,end", [
+    (11, 22), (95, 115), (998, 1012), (1188511880, 1188511890),
+    (222220, 222224), (1698522, 1698528), (446443, 446449),
+    (38593856, 38593862), (0, 100000),
+])
+def test_doubled_matches_brute_force(start, end):
+    """Test the arithmetic count, sum and listing on known ranges."""
+    count, total, found = brute_force(start, end, has_doubled_halves)
+    assert count_doubled_ids(start, end) == (count, total)
+    assert list(iter_doubled_ids(start, end)) == found
+
+
+def test_doubled_random_ranges():
+    """Test random ranges across digit-length boundaries."""
+    rng = random.Random(2)
+    for _ in range(200):
+        start = rng.randint(0, 10 ** rng.randint(1, 7))
+        end = start + rng.randint(0, 5000)
+        count, total, _ = brute_force(start, end, has_doubled_halves)
+        assert count_doubled_ids(start, end) == (count, total)
+
+
+def test_doubled_huge_range():
+    """Test a range far too wide to scan."""
+    # Every 2k-digit pattern for k = 1..9 appears once
+    count, total = count_doubled_ids(1, 10 ** 18 - 1)
+    assert count == sum(9 * 10 ** (k - 1) for k in range(1, 10))
+    assert count_doubled_ids(10 ** 10, 10 ** 10 + 10 ** 9)[0] == 0
+
+
+def test_has_repeated_pattern():
+    """Test the any-repeat string predicate."""
+    assert has_repeated_pattern(111)
+    assert has_repeated_pattern(121212)
+    assert has_repeated_pattern(1188511885)
+    assert not has_repeated_pattern(7)
+    assert not has_repeated_pattern(1231)
+
+
+def test_divisors_and_mobius():
+    """Test the number theory helpers."""
+    assert divisors(12) == [1, 2, 3, 4, 6, 12]
+    assert [mobius(n) for n in range(1, 11)] == [
+        1, -1, -1, 0, -1, 1, -1, 0, 0, 1
+    ]
+
+
+@pytest.mark.parametrize("start,end", [
+    (11, 22), (95, 115), (998, 1012), (565653, 565659),
+    (824824821, 824824827), (2121212118, 2121212124),
+    (111110, 111112), (0, 200000),
+])
+def test_repeated_matches_brute_force(start, end):
+    """Test the inclusion-exclusion count, sum and listing."""
+    count, total, found = brute_force(start, end, has_repeated_pattern)
+    assert count_repeated_ids(start, end) == (count, total)
+    assert list(iter_repeated_ids(start, end)) == found
+
+
+def test_repeated_random_ranges():
+    """Test random ranges, including multi-period lengths like 12."""
+    rng = random.Random(3)
+    for _ in range(200):
+        start = rng.randint(0, 10 ** rng.randint(1, 12))
+        end = start + rng.randint(0, 3000)
+        count, total, _ = brute_force(start, end, has_repeated_pattern)
+        assert count_repeated_ids(start, end) == (count, total)
+
+
+def test_repeated_counts_each_id_once():
+    """Test that IDs with several periods are not double counted."""
+    assert count_repeated_ids(111111, 111111) == (1, 111111)
+    assert count_repeated_ids(1, 99) == (9, 495)
+    # All 12-digit IDs: periods 1, 2, 3, 4 and 6 overlap heavily
+    twelve = set(
+        h * (10 ** 12 - 1) // (10 ** p - 1)
+        for p in (1, 2, 3, 4, 6) for h in range(10 ** (p - 1), 10 ** p)
+    )
+    assert count_repeated_ids(10 ** 11, 10 ** 12 - 1) == (
+        len(twelve), sum(twelve)
+    )
+
+
+@pytest.fixture
+def repeated_index(tmp_path):
+    prefix = str(tmp_path / "repeated")
+    build_index(prefix, max_digits=8, kind='repeated')
+    return InvalidIdIndex(prefix)
+
+
+def test_build_index_contents(tmp_path):
+    """Test that the index holds every invalid ID in order."""
+    prefix = str(tmp_path / "doubled")
+    count = build_index(prefix, max_digits=4, kind='doubled')
+    index = InvalidIdIndex(prefix)
+
+    expected = [n for n in range(1, 10000) if has_doubled_halves(n)]
+    assert count == len(index) == len(expected)
+    assert index.ids.tolist() == expected
+    assert index.sums[-1] == sum(expected)
+
+
+def test_index_range_stats(repeated_index):
+    """Test binary-search counts and sums against the closed form."""
+    rng = random.Random(5)
+    for _ in range(300):
+        start = rng.randint(0, 10 ** rng.randint(1, 8) - 1)
+        end = rng.randint(start, 10 ** 8 - 1)
+        assert repeated_index.range_stats(start, end) == \
+            count_repeated_ids(start, end)
+
+
+def test_index_query_top_k(repeated_index):
+    """Test the combined count, sum and top k over a range list."""
+    ranges = [(11, 22), (95, 115), (998, 1012), (565653, 565659),
+              (1000, 5000)]
+    found = sorted({n for start, end in ranges
+                    for n in range(start, end + 1)
+                    if has_repeated_pattern(n)}, reverse=True)
+    result = repeated_index.query(ranges, k=5)
+
+    assert result['top'] == found[:5]
+    assert result['count'] == sum(count_repeated_ids(*r)[0] for r in ranges)
+
+
+def test_index_rejects_ranges_beyond_limit(repeated_index):
+    """Test that ranges past the digit limit are refused."""
+    with pytest.raises(ValueError):
+        repeated_index.range_stats(1, 10 ** 9)
+
+
+def test_index_limit_covers_odd_max_digits(tmp_path):
+    """Test that the limit follows max_digits, not the largest ID."""
+    prefix = str(tmp_path / "doubled")
+    build_index(prefix, max_digits=5, kind='doubled')
+    index = InvalidIdIndex(prefix)
+
+    assert index.kind == 'doubled'
+    assert index.limit == 99999
+    assert index.range_stats(1, 99999) == count_doubled_ids(1, 99999)
+    with pytest.raises(ValueError):
+        index.range_stats(1, 100000)
+
+
+def test_build_index_overflow(tmp_path):
+    """Test that prefix sums that would overflow uint64 are refused."""
+    with pytest.raises(ValueError):
+        build_index(str(tmp_path / "big"), max_digits=14)
+
+
+def test_parse_ranges():
+    """Test parsing the comma-separated input format."""
+    assert parse_ranges("11-22,95-115\n") == [(11, 22), (95, 115)]
+
+
+def test_merge_ranges():
+    """Test merging overlapping, nested, duplicate and adjacent ranges."""
+    ranges = [(50, 60), (1, 10), (5, 20), (21, 30), (50, 60), (52, 55),
+              (100, 90)]
+    assert merge_ranges(ranges) == [(1, 30), (50, 60)]
+
+
+def test_split_digit_lengths():
+    """Test splitting ranges at powers of ten."""
+    assert split_digit_lengths([(0, 9), (95, 1005)]) == [
+        (0, 9), (95, 99), (100, 999), (1000, 1005)
+    ]
+
+
+def test_load_ranges_counts_each_id_once(tmp_path):
+    """Test that overlapping input ranges no longer double count."""
+    path = tmp_path / "ranges.csv"
+    path.write_text("1000-1500,1200-2000,95-115,99-99\n")
+    ranges = load_ranges(str(path))
+
+    assert ranges == [(95, 99), (100, 115), (1000, 2000)]
+    assert all(len(str(s)) == len(str(e)) for s, e in ranges)
+    count = sum(count_doubled_ids(s, e)[0] for s, e in ranges)
+    assert count == brute_force(95, 115, has_doubled_halves)[0] + \
+        brute_force(1000, 2000, has_doubled_halves)[0]
+
+
+def is_palindrome(num):
+    """An ad-hoc predicate without a closed form."""
+    return str(num) == str(num)[::-1]
+
+
+def test_iter_chunks():
+    """Test cutting ranges into fixed-size inclusive chunks."""
+    assert list(iter_chunks([(1, 10), (20, 22)], chunk_size=4)) == [
+        (1, 4, (1, 10)), (5, 8, (1, 10)), (9, 10, (1, 10)),
+        (20, 22, (20, 22)),
+    ]
+
+
+def test_scan_chunk():
+    """Test the per-chunk partial result."""
+    partial = scan_chunk((has_doubled_halves, 1, 100, 3, (1, 500)))
+    assert partial['range'] == (1, 500)
+    assert partial['count'] == 9
+    assert partial['sum'] == 495
+    assert partial['top'] == [99, 88, 77]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_scan_ranges_matches_closed_form(num_workers):
+    """Test that merged chunk partials equal the closed-form totals."""
+    ranges = [(95, 115), (998, 1012), (100000, 130000)]
+    result = merge_partials(
+        scan_ranges(ranges, has_repeated_pattern, chunk_size=777,
+                    num_workers=num_workers, top_k=4),
+        top_k=4,
+    )
+    count = sum(count_repeated_ids(*r)[0] for r in ranges)
+    total = sum(count_repeated_ids(*r)[1] for r in ranges)
+
+    assert (result['count'], result['sum']) == (count, total)
+    assert result['top'] == [129129, 128128, 127127, 126126]
+
+
+def test_scan_ranges_custom_predicate():
+    """Test a pluggable predicate in the process pool."""
+    result = merge_partials(
+        scan_ranges([(1, 5000)], is_palindrome, chunk_size=300,
+                    num_workers=2, top_k=2),
+        top_k=2,
+    )
+    assert result['count'] == 9 + 9 + 90 + 40
+    assert result['top'] == [4994, 4884]
+
+
+@pytest.mark.parametrize("mask, predicate", [
+    (doubled_mask, has_doubled_halves),
+    (repeated_mask, has_repeated_pattern),
+])
+def test_masks_match_string_predicates(mask, predicate):
+    """Test the vectorized period checks against the string versions."""
+    values = np.concatenate([
+        np.arange(1, 200_000),
+        np.arange(10 ** 9 - 5000, 10 ** 9 + 5000),
+    ]).astype(np.uint64)
+    expected = [predicate(int(v)) for v in values]
+    assert mask(values).tolist() == expected
+
+
+def test_masks_near_uint64_limit():
+    """Test 18- and 19-digit IDs, whose products still fit in uint64."""
+    values = np.array([123456789 * (10 ** 9 + 1), 10 ** 18 + 1,
+                       9_999_999_999_999_999_999, 1212121212121212121,
+                       121212121212121212], dtype=np.uint64)
+    assert repeated_mask(values).tolist() == [True, False, True, False, True]
+    assert doubled_mask(values).tolist() == [True, False, False, False, False]
+
+
+def test_scan_block_matches_scan_chunk():
+    """Test the vectorized chunk scan against the per-ID one."""
+    block = scan_block((repeated_mask, 95, 130000, 5, (95, 130000)))
+    chunk = scan_chunk((has_repeated_pattern, 95, 130000, 5, (95, 130000)))
+    assert block == chunk
+
+
+def test_aggregator_matches_sorting():
+    """Test the streaming top-k and totals against sorting everything."""
+    rng = random.Random(15)
+    nums = [rng.randrange(10 ** 12) for _ in range(5000)]
+    aggregator = InvalidIdAggregator(top_k=10)
+    for num in nums:
+        aggregator.add(num)
+
+    result = aggregator.result()
+    assert result['top'] == sorted(nums, reverse=True)[:10]
+    assert (result['count'], result['sum']) == (len(nums), sum(nums))
+
+
+def test_aggregator_per_range_and_partials():
+    """Test per-range histograms fed by IDs, stats and scanner partials."""
+    aggregator = InvalidIdAggregator(top_k=3, per_range=True)
+    assert list(aggregator.track([11, 22], key='a')) == [11, 22]
+    aggregator.add_stats(2, 2020, top=[1010, 1010], key='b')
+    aggregator.merge({'start': 1, 'end': 100, 'range': (1, 100),
+                      'count': 1, 'sum': 33, 'top': [33]})
+
+    assert aggregator.result() == {
+        'count': 5, 'sum': 2086, 'top': [1010, 1010, 33],
+        'ranges': {'a': (2, 33), 'b': (2, 2020), (1, 100): (1, 33)},
+    }
+
+
+def test_aggregator_without_top():
+    """Test that top_k=0 keeps totals only."""
+    aggregator = InvalidIdAggregator(top_k=0)
+    aggregator.add_stats(3, 99, top=[44, 33, 22])
+    assert aggregator.result() == {'count': 3, 'sum': 99, 'top': []}
+
+
+@pytest.mark.parametrize("items", [[], [7], [11, 22, 1010]])
+def test_print_list_matches_print(items):
+    """Test that streamed listings look exactly like print(list)."""
+    streamed, printed = io.StringIO(), io.StringIO()
+    print_list(iter(items), "  IDs: ", file=streamed)
+    print(f"  IDs: {items}", file=printed)
+    assert streamed.getvalue() == printed.getvalue()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_histogram_keyed_by_source_range(num_workers):
+    """Test that chunks of one wide range share a histogram entry."""
+    ranges = [(1, 5000), (9000, 9999)]
+    aggregator = InvalidIdAggregator(top_k=1, per_range=True)
+    for partial in scan_ranges(ranges, repeated_mask, chunk_size=700,
+                               num_workers=num_workers, vectorized=True):
+        aggregator.merge(partial)
+
+    assert aggregator.result()['ranges'] == {
+        r: count_repeated_ids(*r) for r in ranges
+    }
@@ -1,20 +1,11 @@
-with open('3.csv', 'r') as f:
-    lines = f.readlines()
+from joltage import iter_banks, max_joltage
 
 total = 0
-for line_num, line in enumerate(lines, 1):
-    line = line.strip()
-    if not line:
-        continue
-
-    max_num = 0
-    # Try all pairs where first digit position < second digit position
-    for i in range(len(line)):
-        if line[i].isdigit():
-            for j in range(i + 1, len(line)):
-                if line[j].isdigit():
-                    two_digit = int(line[i] + line[j])
-                    max_num = max(max_num, two_digit)
+# Lines arrive as views of digit values translated from the raw bytes
+for line_num, digits in iter_banks('3.csv'):
+    # The best ordered pair is the largest 2-digit subsequence, found in
+    # one monotonic-stack pass instead of trying all pairs
+    max_num = max_joltage(digits, 2) if len(digits) >= 2 else 0
 
     print(f"Line {line_num}: max two-digit number = {max_num}")
     total += max_num
@@ -1,32 +1,16 @@
-from itertools import combinations
-
-with open('3.csv', 'r') as f:
-    lines = f.readlines()
+from joltage import iter_banks, max_joltage
 
 total = 0
-for line_num, line in enumerate(lines, 1):
-    line = line.strip()
-    if not line:
-        continue
-
-    # Get all digit positions
-    digit_positions = []
-    for i, char in enumerate(line):
-        if char.isdigit():
-            digit_positions.append((i, char))
-
+# Lines arrive as views of digit values translated from the raw bytes
+for line_num, digits in iter_banks('3.csv'):
     # If we don't have 12 digits, skip or handle accordingly
-    if len(digit_positions) < 12:
-        print(f"Line {line_num}: only {len(digit_positions)} digits available")
+    if len(digits) < 12:
+        print(f"Line {line_num}: only {len(digits)} digits available")
         continue
 
-    max_num = 0
-    # Try all combinations of 12 positions (maintaining order)
-    for combo in combinations(range(len(digit_positions)), 12):
-        # Form the 12-digit number from selected positions
-        num_str = ''.join(digit_positions[i][1] for i in combo)
-        num = int(num_str)
-        max_num = max(max_num, num)
+    # The best of all combinations of 12 positions (maintaining order) is
+    # the largest 12-digit subsequence, found without enumerating them
+    max_num = max_joltage(digits, 12)
 
     print(f"Line {line_num}: max 12-digit number = {max_num}")
     total += max_num
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Max joltage of every bank for every number of batteries k.
+
+Writes one line per bank with the comma-separated answers for
+k = 1..len(bank), and prints the total over all banks for a few k.
+
+Usage:
+    python 3_solve_all_k.py [3.csv] [3_all_k.csv] [--totals 2,12]
+"""
+import argparse
+
+from joltage import ascii_value, iter_banks, iter_max_digits, value_ascii
+
+parser = argparse.ArgumentParser(
+    description="Day 3 max joltage for every k"
+)
+parser.add_argument('filename', nargs='?', default='3.csv')
+parser.add_argument('output', nargs='?', default='3_all_k.csv')
+parser.add_argument('--totals', default='2,12',
+                    help="comma-separated k values to print totals for")
+args = parser.parse_args()
+
+report_ks = [int(k) for k in args.totals.split(',') if k]
+totals = dict.fromkeys(report_ks, 0)
+banks = 0
+
+with open(args.output, 'wb') as out:
+    for _, digits in iter_banks(args.filename):
+        # One removal order gives the answers for every k; they are
+        # written as ASCII digits and only the reported k become ints
+        for k, text in enumerate(iter_max_digits(digits), 1):
+            if k > 1:
+                out.write(b',')
+            out.write(text)
+            if k in totals:
+                totals[k] += ascii_value(text)
+        out.write(b'\n')
+        banks += 1
+
+print(f"Wrote max joltage for every k of {banks} banks to '{args.output}'")
+for k, total in totals.items():
+    print(f"Total sum for k={k}: {value_ascii(total)}")
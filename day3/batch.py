@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Parallel batch runner for the day 3 solvers over many bank files.
+
+Each file is split on line boundaries into byte ranges, a process pool
+computes the max joltage of every line of a range for each requested k,
+and the per-range totals are merged in file order. Per-line answers are
+only kept and printed on request, since printing every line is itself
+the bottleneck on files with millions of banks.
+
+Lines with fewer than k digits contribute nothing to the total for k.
+
+Usage:
+    python batch.py [3.csv ...] [--k 2,12] [--workers N] [--per-line]
+"""
+import argparse
+import itertools
+import os
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from joltage import max_joltage, split_digit_lines, value_ascii
+
+CHUNK_BYTES = 1 << 22
+
+
+def split_byte_ranges(filename: str, parts: int) -> List[Tuple[int, int]]:
+    """Split a file into up to `parts` byte ranges on line boundaries."""
+    size = os.path.getsize(filename)
+    bounds = [0]
+    with open(filename, 'rb') as f:
+        for part in range(1, parts):
+            target = max(size * part // parts, bounds[-1])
+            f.seek(target)
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(begin, end) for begin, end in zip(bounds, bounds[1:])
+            if end > begin]
+
+
+def solve_range(args: Tuple[str, int, int, Sequence[int], bool]) -> Dict:
+    """
+    Totals for each k over the lines in one byte range of a file, and
+    optionally (local line index, answers) for every line with digits.
+    """
+    filename, begin, end, ks, per_line = args
+    totals = dict.fromkeys(ks, 0)
+    answers = []
+    lines = 0
+    with open(filename, 'rb') as f:
+        f.seek(begin)
+        while begin < end:
+            block = f.read(min(CHUNK_BYTES, end - begin))
+            begin += len(block)
+            if begin < end:
+                # Finish the line so no bank is split across blocks
+                extra = f.readline()
+                block += extra
+                begin += len(extra)
+            for digits in split_digit_lines(block):
+                lines += 1
+                if not digits:
+                    continue
+                values = [max_joltage(digits, k) if k <= len(digits)
+                          else None for k in ks]
+                for k, value in zip(ks, values):
+                    if value is not None:
+                        totals[k] += value
+                if per_line:
+                    answers.append((lines, values))
+    return {'lines': lines, 'totals': totals, 'answers': answers}
+
+
+def run_batch(filenames: Sequence[str], ks: Sequence[int],
+              num_workers: int = None, chunks_per_worker: int = 4,
+              per_line: bool = False) -> Iterator[Dict]:
+    """
+    Yield, in file order, one result per file with its totals for each
+    k and, with per_line, (line number, answers) for every bank.
+    """
+    if num_workers is None:
+        num_workers = cpu_count()
+    # Repeated k values would be solved and totalled twice
+    ks = tuple(dict.fromkeys(ks))
+    parts = num_workers * chunks_per_worker
+    file_ranges = [split_byte_ranges(filename, parts)
+                   for filename in filenames]
+    tasks = [(filename, begin, end, ks, per_line)
+             for filename, ranges in zip(filenames, file_ranges)
+             for begin, end in ranges]
+    with Pool(processes=num_workers) as pool:
+        results = pool.imap(solve_range, tasks)
+        for filename, ranges in zip(filenames, file_ranges):
+            merged = {'filename': filename, 'lines': 0,
+                      'totals': dict.fromkeys(ks, 0), 'answers': []}
+            for part in itertools.islice(results, len(ranges)):
+                for k, total in part['totals'].items():
+                    merged['totals'][k] += total
+                # Ranges arrive in file order, so line numbers continue
+                merged['answers'].extend(
+                    (merged['lines'] + line, values)
+                    for line, values in part['answers']
+                )
+                merged['lines'] += part['lines']
+            yield merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Parallel day 3 max joltage over many bank files"
+    )
+    parser.add_argument('filenames', nargs='*', default=['3.csv'])
+    parser.add_argument('--k', default='2,12',
+                        help="comma-separated numbers of batteries")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunks-per-worker', type=int, default=4)
+    parser.add_argument('--per-line', action='store_true',
+                        help="also print the answers for every line")
+    args = parser.parse_args()
+
+    ks = list(dict.fromkeys(int(k) for k in args.k.split(',') if k))
+    grand = dict.fromkeys(ks, 0)
+    for result in run_batch(args.filenames, ks, args.workers,
+                            args.chunks_per_worker, args.per_line):
+        for line_num, values in result['answers']:
+            print(f"{result['filename']} line {line_num}: " + ", ".join(
+                f"k={k} {value_ascii(value)}" for k, value in zip(ks, values)
+                if value is not None
+            ))
+        for k, total in result['totals'].items():
+            print(f"{result['filename']}: total for k={k}: "
+                  f"{value_ascii(total)}")
+            grand[k] += total
+    if len(args.filenames) > 1:
+        for k, total in grand.items():
+            print(f"All files: total for k={k}: {value_ascii(total)}")
@@ -0,0 +1,149 @@
+"""
+Maximum joltage of day 3 battery banks.
+
+The largest k-digit number that keeps the digits of a bank in order is
+its lexicographically largest length-k subsequence. A monotonic stack
+finds it in one O(n) pass for any k: a digit evicts smaller digits
+before it for as long as n - k digits may still be dropped.
+
+The answers for different k are nested: running the stack with no drop
+limit pops digits in the order the greedy drops them, and the stack left
+at the end is dropped from its tail. That one removal order gives the
+best subsequence for every k at once.
+
+Input is parsed as bytes: one bytes.translate() call maps every ASCII
+digit of a file to its value and drops everything else except newlines,
+and each line is handed out as a memoryview of that buffer. Iterating a
+view yields small ints, so no per-character objects are created.
+"""
+from typing import Iterator, List, Sequence, Tuple, Union
+
+NEWLINE = ord('\n')
+DIGIT_VALUES = bytes.maketrans(b'0123456789', bytes(range(10)))
+VALUE_DIGITS = bytes.maketrans(bytes(range(10)), b'0123456789')
+NON_DIGITS = bytes(set(range(256)) - set(b'0123456789\n'))
+# Longest digit run converted by a single int() call; well under the
+# smallest int/str conversion limit Python allows (640 digits)
+FOLD_DIGITS = 512
+
+
+def parse_digits(line: Union[bytes, str]) -> bytes:
+    """Digit values of a bank line, ignoring any other characters."""
+    if isinstance(line, str):
+        line = line.encode()
+    return line.translate(DIGIT_VALUES, NON_DIGITS + b'\n')
+
+
+def split_digit_lines(data: bytes) -> List[memoryview]:
+    """
+    Digit values of every line of a buffer (blank lines included) as
+    zero-copy views into a single translated copy of it.
+    """
+    values = memoryview(data.translate(DIGIT_VALUES, NON_DIGITS))
+    raw_lines = data.count(b'\n') + (data[-1:] not in (b'', b'\n'))
+    lines = []
+    start = 0
+    for _ in range(raw_lines):
+        end = values.obj.find(NEWLINE, start)
+        if end < 0:
+            end = len(values)
+        lines.append(values[start:end])
+        start = end + 1
+    return lines
+
+
+def read_digit_lines(filename: str) -> List[memoryview]:
+    """split_digit_lines() of a whole file."""
+    with open(filename, 'rb') as f:
+        return split_digit_lines(f.read())
+
+
+def iter_banks(filename: str) -> Iterator[Tuple[int, memoryview]]:
+    """(line number, digit values) of every line with digits on it."""
+    for line_num, digits in enumerate(read_digit_lines(filename), 1):
+        if digits:
+            yield line_num, digits
+
+
+def max_subsequence(digits: Sequence[int], k: int) -> List[int]:
+    """Lexicographically largest length-k subsequence of digits."""
+    if not 0 <= k <= len(digits):
+        raise ValueError(f"Cannot pick {k} of {len(digits)} digits")
+    drop = len(digits) - k
+    stack: List[int] = []
+    for digit in digits:
+        while drop and stack and stack[-1] < digit:
+            stack.pop()
+            drop -= 1
+        stack.append(digit)
+    return stack[:k]
+
+
+def ascii_value(text: bytes) -> int:
+    """
+    The number spelled by ASCII digits, of any length.
+
+    Blocks of up to FOLD_DIGITS digits go through int(), below Python's
+    int/str conversion limit, and are folded as high * 10^len(low) + low
+    by halves, so long numbers cost a few big multiplies and no digit
+    limit applies.
+    """
+    if len(text) <= FOLD_DIGITS:
+        return int(text or b'0')
+    half = len(text) // 2
+    return (ascii_value(text[:half]) * 10 ** (len(text) - half)
+            + ascii_value(text[half:]))
+
+
+def value_ascii(value: int) -> str:
+    """Decimal text of a non-negative int of any length (see ascii_value)."""
+    if value.bit_length() <= FOLD_DIGITS * 3:
+        return str(value)
+    # About half of the decimal digits, from log10(2) ~ 0.301
+    low_digits = value.bit_length() * 301 // 2000
+    high, low = divmod(value, 10 ** low_digits)
+    return value_ascii(high) + value_ascii(low).zfill(low_digits)
+
+
+def digits_value(digits: Sequence[int]) -> int:
+    """The number spelled by a sequence of digits, of any length."""
+    return ascii_value(bytes(digits).translate(VALUE_DIGITS))
+
+
+def max_joltage(digits: Sequence[int], k: int) -> int:
+    """Largest k-digit number that keeps the digits in order."""
+    return digits_value(max_subsequence(digits, k))
+
+
+def removal_order(digits: Sequence[int]) -> List[int]:
+    """
+    Positions in the order the greedy drops them, so the best length-k
+    subsequence keeps every position except the first n - k.
+    """
+    order: List[int] = []
+    stack: List[int] = []
+    for pos, digit in enumerate(digits):
+        while stack and digits[stack[-1]] < digit:
+            order.append(stack.pop())
+        stack.append(pos)
+    order.extend(reversed(stack))
+    return order
+
+
+def iter_max_digits(digits: Sequence[int]) -> Iterator[bytearray]:
+    """
+    ASCII digits of the max joltage for every k from 1 to len(digits),
+    in order of k, without converting any answer to an int.
+    """
+    ascii_digits = bytes(digits).translate(VALUE_DIGITS)
+    # Positions not kept yet hold a byte translate() deletes; they are
+    # put back in reverse removal order, one per k
+    text = bytearray(b'x' * len(ascii_digits))
+    for pos in reversed(removal_order(digits)):
+        text[pos] = ascii_digits[pos]
+        yield text.translate(None, b'x')
+
+
+def all_max_joltages(digits: Sequence[int]) -> List[int]:
+    """Max joltage for every k from 1 to len(digits), in order of k."""
+    return [ascii_value(text) for text in iter_max_digits(digits)]
@@ -0,0 +1,239 @@
+import os
+import random
+from itertools import combinations
+
+import pytest
+from joltage import (ascii_value, value_ascii, parse_digits, read_digit_lines,
+                     iter_banks, max_subsequence, digits_value, max_joltage,
+                     removal_order, all_max_joltages, iter_max_digits)
+import batch
+from batch import split_byte_ranges, solve_range, run_batch
+from bank_index import next_positions, BankIndex, index_path, load_index
+
+
+def brute_force(digits, k):
+    """Largest k-digit number over every ordered choice of positions."""
+    return max(digits_value(combo) for combo in combinations(digits, k))
+
+
+def test_parse_digits():
+    """Test that non-digit characters are ignored."""
+    assert list(parse_digits("98a7 1\n")) == [9, 8, 7, 1]
+    assert list(parse_digits(b"0 5\r\n")) == [0, 5]
+
+
+def test_read_digit_lines(tmp_path):
+    """Test per-line digit views, keeping blank lines in place."""
+    banks = tmp_path / "banks.csv"
+    banks.write_bytes(b"12\r\n\n3x4\n56")
+    assert [list(line) for line in read_digit_lines(str(banks))] == [
+        [1, 2], [], [3, 4], [5, 6]
+    ]
+    assert [num for num, _ in iter_banks(str(banks))] == [1, 3, 4]
+    banks.write_bytes(b"7\n")
+    assert [list(line) for line in read_digit_lines(str(banks))] == [[7]]
+
+
+@pytest.mark.parametrize("line, k, expected", [
+    ("987654321111111", 2, 98),
+    ("811111111111119", 2, 89),
+    ("234234234234278", 2, 78),
+    ("818181911112111", 2, 92),
+    ("987654321111111", 12, 987654321111),
+    ("811111111111119", 12, 811111111119),
+    ("234234234234278", 12, 434234234278),
+    ("818181911112111", 12, 888911112111),
+])
+def test_max_joltage_examples(line, k, expected):
+    """Test the worked examples for 2 and 12 batteries."""
+    assert max_joltage(parse_digits(line), k) == expected
+
+
+def test_max_subsequence_matches_brute_force():
+    """Test every k on random short banks against all combinations."""
+    rng = random.Random(3)
+    for _ in range(500):
+        digits = [rng.randint(1, 9) for _ in range(rng.randint(1, 10))]
+        for k in range(1, len(digits) + 1):
+            assert max_joltage(digits, k) == brute_force(digits, k)
+
+
+def test_max_subsequence_edges():
+    """Test picking nothing, everything, and too much."""
+    assert max_subsequence([3, 1, 2], 0) == []
+    assert max_subsequence([3, 1, 2], 3) == [3, 1, 2]
+    with pytest.raises(ValueError):
+        max_subsequence([3, 1, 2], 4)
+
+
+def test_removal_order():
+    """Test that pops come first and the final stack drops from its tail."""
+    assert removal_order([1, 3, 2, 4]) == [0, 2, 1, 3]
+    assert sorted(removal_order([5, 5, 1, 9, 0])) == [0, 1, 2, 3, 4]
+
+
+def test_all_max_joltages_matches_per_k():
+    """Test the single-pass sweep against the per-k engine."""
+    rng = random.Random(17)
+    for _ in range(300):
+        digits = [rng.randint(0, 9) for _ in range(rng.randint(1, 40))]
+        assert all_max_joltages(digits) == [
+            max_joltage(digits, k) for k in range(1, len(digits) + 1)
+        ]
+
+
+def test_next_positions():
+    """Test the next-occurrence table, with the length as sentinel."""
+    table = next_positions([3, 1, 3])
+    assert table[3].tolist() == [0, 2, 2, 3]
+    assert table[1].tolist() == [1, 1, 3, 3]
+    assert table[9].tolist() == [3, 3, 3, 3]
+
+
+def test_bank_index_matches_stack():
+    """Test indexed picks, with and without windows, against the stack."""
+    rng = random.Random(18)
+    lines = [[rng.randint(0, 9) for _ in range(rng.randint(0, 30))]
+             for _ in range(40)]
+    index = BankIndex(lines)
+    for line_num, digits in enumerate(lines, 1):
+        assert index.length(line_num) == len(digits)
+        for k in range(len(digits) + 1):
+            assert index.max_subsequence(line_num, k) == \
+                max_subsequence(digits, k)
+        if len(digits) > 5:
+            begin, end = 2, len(digits) - 1
+            assert index.max_joltage(line_num, 3, begin, end) == \
+                max_joltage(digits[begin:end], 3)
+
+
+def test_load_index_persists_and_rebuilds(tmp_path):
+    """Test that the saved index is reused and rebuilt when stale."""
+    banks = tmp_path / "banks.csv"
+    banks.write_text("987654321111111\n\n811111111111119\n")
+    index = load_index(str(banks))
+    assert os.path.exists(index_path(str(banks)))
+    assert load_index(str(banks)).max_joltage(3, 2) == 89
+    assert index.length(2) == 0
+
+    banks.write_text("12\n")
+    assert load_index(str(banks)).max_joltage(1, 2) == 12
+
+
+def write_banks(path, count, seed):
+    """Write `count` random bank lines, some blank or short."""
+    rng = random.Random(seed)
+    lines = ["".join(rng.choice("123456789")
+                     for _ in range(rng.choice([0, 1, 5, 15, 40])))
+             for _ in range(count)]
+    path.write_text("\n".join(lines) + "\n")
+    return [parse_digits(line) for line in lines]
+
+
+def test_split_byte_ranges(tmp_path):
+    """Test that ranges cover the file and end on line boundaries."""
+    banks = tmp_path / "banks.csv"
+    write_banks(banks, 200, 20)
+    data = banks.read_bytes()
+    ranges = split_byte_ranges(str(banks), 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(e == b for (_, e), (b, _) in zip(ranges, ranges[1:]))
+    assert all(data[e - 1:e] == b"\n" for _, e in ranges)
+
+
+def test_solve_range_small_blocks(tmp_path, monkeypatch):
+    """Test that blocks are cut on line boundaries inside a range."""
+    banks = tmp_path / "banks.csv"
+    lines = write_banks(banks, 100, 21)
+    monkeypatch.setattr(batch, "CHUNK_BYTES", 64)
+    result = solve_range((str(banks), 0, banks.stat().st_size, (2, 12),
+                          True))
+    assert result["lines"] == 100
+    assert result["totals"][12] == sum(
+        max_joltage(digits, 12) for digits in lines if len(digits) >= 12
+    )
+    assert [line for line, _ in result["answers"]] == [
+        num for num, digits in enumerate(lines, 1) if digits
+    ]
+
+
+def test_run_batch_matches_serial(tmp_path):
+    """Test merged parallel totals and line numbers across files."""
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    files = {str(first): write_banks(first, 150, 22),
+             str(second): write_banks(second, 80, 23)}
+    results = list(run_batch(list(files), [2, 12], num_workers=2,
+                             chunks_per_worker=3, per_line=True))
+
+    assert [result["filename"] for result in results] == list(files)
+    for result in results:
+        lines = files[result["filename"]]
+        assert result["lines"] == len(lines)
+        for k in (2, 12):
+            assert result["totals"][k] == sum(
+                max_joltage(digits, k) for digits in lines
+                if len(digits) >= k
+            )
+        for line_num, values in result["answers"]:
+            digits = lines[line_num - 1]
+            assert values[0] == (max_joltage(digits, 2)
+                                 if len(digits) >= 2 else None)
+
+
+def test_long_values_beyond_int_str_limit():
+    """Test k above Python's 4300-digit int/str limit, in both engines."""
+    rng = random.Random(19)
+    digits = [rng.randint(0, 9) for _ in range(6000)]
+    k = 5000
+    picked = max_subsequence(digits, k)
+    expected = 0
+    for digit in picked:
+        expected = expected * 10 + digit
+
+    assert digits_value(picked) == expected
+    assert max_joltage(digits, k) == expected
+    assert BankIndex([digits]).max_joltage(1, k) == expected
+
+
+def test_iter_max_digits_long_line():
+    """Test ASCII answers for a line longer than the 4300-digit limit."""
+    rng = random.Random(170)
+    digits = [rng.randint(0, 9) for _ in range(5000)]
+    answers = iter_max_digits(digits)
+    for k, text in enumerate(answers, 1):
+        if k in (1, 2, 2500, 4301, 5000):
+            expected = bytes(d + 48 for d in max_subsequence(digits, k))
+            assert text == expected
+    assert k == 5000
+
+
+@pytest.mark.parametrize("length", [1, 512, 513, 1600, 9000])
+def test_ascii_round_trip_any_length(length):
+    """Test text/int conversions on both sides of the 4300-digit limit."""
+    rng = random.Random(length)
+    text = str(rng.randint(1, 9)) + "".join(
+        str(rng.randint(0, 9)) for _ in range(length - 1))
+    value = ascii_value(text.encode())
+    assert value_ascii(value) == text
+    assert value_ascii(0) == "0"
+
+
+@pytest.mark.parametrize("line, k, begin, end", [
+    (0, 1, 0, None), (3, 1, 0, None), (-1, 1, 0, None),
+    (1, 5, -1, None), (1, 1, 3, 2), (1, 5, 0, None),
+])
+def test_bank_index_rejects_bad_queries(line, k, begin, end):
+    """Test that out-of-range lines and windows raise ValueError."""
+    index = BankIndex([[1, 2, 3, 4], [5, 6]])
+    with pytest.raises(ValueError):
+        index.max_subsequence(line, k, begin, end)
+
+
+def test_run_batch_repeated_k(tmp_path):
+    """Test that a repeated k is solved and totalled once."""
+    banks = tmp_path / "banks.csv"
+    banks.write_text("987654321111\n")
+    result, = run_batch([str(banks)], [2, 12, 2], num_workers=1,
+                        per_line=True)
+    assert result["totals"] == {2: 98, 12: 987654321111}
+    assert result["answers"] == [(1, [98, 987654321111])]
@@ -1,44 +1,34 @@
-# Read the file and create the matrix
-with open('4.csv', 'r') as f:
-    lines = f.readlines()
-
-# Parse the matrix (skip line numbers at the beginning)
-matrix = []
-for line in lines:
-    if line.strip():  # Skip empty lines
-        # Remove the line number prefix (e.g., "     1→")
-        content = line.split('→')[1].strip() if '→' in line else line.strip()
-        matrix.append(content)
-
-rows = len(matrix)
-cols = len(matrix[0]) if rows > 0 else 0
-
-print(f"Matrix dimensions: {rows} rows x {cols} columns")
-
-# Count rolls with fewer than 4 adjacent rolls
-count = 0
-
-# Define the 8 directions: up, down, left, right, and 4 diagonals
-directions = [
-    (-1, -1), (-1, 0), (-1, 1),  # top-left, top, top-right
-    (0, -1),           (0, 1),   # left, right
-    (1, -1),  (1, 0),  (1, 1)    # bottom-left, bottom, bottom-right
-]
-
-for i in range(rows):
-    for j in range(len(matrix[i])):
-        if matrix[i][j] == '@':
-            # Count adjacent rolls
-            adjacent_rolls = 0
-            for di, dj in directions:
-                ni, nj = i + di, j + dj
-                # Check if the neighbor is within bounds
-                if 0 <= ni < rows and 0 <= nj < len(matrix[ni]):
-                    if matrix[ni][nj] == '@':
-                        adjacent_rolls += 1
-
-            # Check if this roll has fewer than 4 adjacent rolls
-            if adjacent_rolls < 4:
-                count += 1
-
-print(f"\nNumber of rolls with fewer than 4 adjacent rolls: {count}")
+import sys
+
+from bitgrid import BitGrid
+from rolls import load_grid, accessible
+from tiled import TiledGrid
+
+# --bitset packs every row into one int instead of a boolean array,
+# --tiled splits the grid into row bands counted by a process pool
+BITSET = '--bitset' in sys.argv[1:]
+TILED = '--tiled' in sys.argv[1:]
+
+if __name__ == "__main__":
+    # Read the grid (line number prefixes are skipped)
+    if BITSET:
+        bits = BitGrid.load('4.csv')
+        rows, cols = len(bits), bits.width
+    else:
+        grid = load_grid('4.csv')
+        rows, cols = grid.shape
+
+    print(f"Matrix dimensions: {rows} rows x {cols} columns")
+
+    # Count rolls with fewer than 4 adjacent rolls; the neighbor counts of
+    # every cell come from eight shifted slices of the padded grid, or from
+    # shifted rows summed into bit planes
+    if BITSET:
+        count = sum(row.bit_count() for row in bits.accessible(4))
+    elif TILED:
+        with TiledGrid(grid) as tiles:
+            count = tiles.count_accessible(4)
+    else:
+        count = int(accessible(grid, 4).sum())
+
+    print(f"\nNumber of rolls with fewer than 4 adjacent rolls: {count}")
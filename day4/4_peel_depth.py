@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Write the wave in which every roll is removed as a uint16 .npy map.
+
+0 marks an empty cell, k a roll removed in wave k and 65535 a roll that
+is never removed. The threshold and the 4/8 neighborhood are
+configurable, so sweeps can reuse the same peeling engine.
+
+Usage:
+    python 4_peel_depth.py [4.csv] [4_depth.npy] [--threshold 4]
+                           [--neighborhood 8]
+"""
+import argparse
+
+import numpy as np
+
+from rolls import NEIGHBORHOODS, NO_ROLL, SURVIVOR, load_grid, peel_depth
+
+parser = argparse.ArgumentParser(description="Day 4 peel-depth map")
+parser.add_argument('filename', nargs='?', default='4.csv')
+parser.add_argument('output', nargs='?', default='4_depth.npy')
+parser.add_argument('--threshold', type=int, default=4)
+parser.add_argument('--neighborhood', type=int, default=8,
+                    choices=sorted(NEIGHBORHOODS))
+args = parser.parse_args()
+
+grid = load_grid(args.filename)
+depth = peel_depth(grid, args.threshold, args.neighborhood)
+np.save(args.output, depth)
+
+removed = depth[(depth != NO_ROLL) & (depth != SURVIVOR)]
+print(f"Matrix dimensions: {grid.shape[0]} rows x {grid.shape[1]} columns")
+print(f"Threshold {args.threshold}, {args.neighborhood}-neighborhood")
+print(f"Waves: {int(removed.max()) if removed.size else 0}")
+print(f"Rolls removed: {removed.size}")
+print(f"Rolls surviving: {int((depth == SURVIVOR).sum())}")
+print(f"Peel-depth map saved to '{args.output}'")
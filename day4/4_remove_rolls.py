@@ -1,86 +1,72 @@
-# Read the file and create the matrix
-with open('4.csv', 'r') as f:
-    lines = f.readlines()
-
-# Parse the matrix (skip line numbers at the beginning)
-matrix = []
-for line in lines:
-    if line.strip():  # Skip empty lines
-        # Remove the line number prefix (e.g., "     1→")
-        content = line.split('→')[1].strip() if '→' in line else line.strip()
-        matrix.append(list(content))  # Convert to list for mutability
-
-rows = len(matrix)
-cols = len(matrix[0]) if rows > 0 else 0
-
-print(f"Matrix dimensions: {rows} rows x {cols} columns")
-
-# Count initial rolls
-initial_rolls = sum(row.count('@') for row in matrix)
-print(f"Initial number of rolls: {initial_rolls}")
-
-# Define the 8 directions
-directions = [
-    (-1, -1), (-1, 0), (-1, 1),  # top-left, top, top-right
-    (0, -1),           (0, 1),   # left, right
-    (1, -1),  (1, 0),  (1, 1)    # bottom-left, bottom, bottom-right
-]
-
-
-def count_adjacent_rolls(matrix, i, j):
-    """Count adjacent rolls for position (i, j)"""
-    adjacent_rolls = 0
-    for di, dj in directions:
-        ni, nj = i + di, j + dj
-        # Check if the neighbor is within bounds
-        if 0 <= ni < len(matrix) and 0 <= nj < len(matrix[ni]):
-            if matrix[ni][nj] == '@':
-                adjacent_rolls += 1
-    return adjacent_rolls
-
-
-# Iteratively remove rolls with fewer than 4 adjacent rolls
-iteration = 0
-total_removed = 0
-
-while True:
-    iteration += 1
-    # Find all rolls with fewer than 4 adjacent rolls
-    to_remove = []
-
-    for i in range(len(matrix)):
-        for j in range(len(matrix[i])):
-            if matrix[i][j] == '@':
-                adjacent_rolls = count_adjacent_rolls(matrix, i, j)
-                if adjacent_rolls < 4:
-                    to_remove.append((i, j))
-
-    # If no rolls to remove, we're done
-    if not to_remove:
-        print(f"\nNo more rolls to remove after iteration {iteration - 1}")
-        break
-
-    # Remove the rolls
-    for i, j in to_remove:
-        matrix[i][j] = '.'
-
-    removed_this_iteration = len(to_remove)
-    total_removed += removed_this_iteration
-
-    print(f"Iteration {iteration}: Removed {removed_this_iteration} rolls "
-          f"(total removed: {total_removed})")
-
-# Count final rolls
-final_rolls = sum(row.count('@') for row in matrix)
-print(f"\nFinal number of rolls: {final_rolls}")
-print(f"Total rolls removed: {total_removed}")
-print(f"Verification: {initial_rolls} - {total_removed} = {final_rolls}")
-
-# Write the result to a new file
-with open('4_processed.csv', 'w') as f:
-    for idx, row in enumerate(matrix, 1):
-        # Format with line numbers like the original
-        line_num = f"{idx:>6}→"
-        f.write(line_num + ''.join(row) + '\n')
-
-print("\nProcessed matrix saved to '4_processed.csv'")
+import sys
+
+from bitgrid import BitGrid
+from rolls import load_grid, iter_waves, save_grid
+from tiled import TiledGrid
+
+# --bitset packs every row into one int instead of a boolean array,
+# --tiled peels row bands with halos in a process pool
+BITSET = '--bitset' in sys.argv[1:]
+TILED = '--tiled' in sys.argv[1:]
+
+
+def remove_waves(grid):
+    """Remove rolls wave by wave from `grid`, yielding each wave's size."""
+    if BITSET:
+        for wave in grid.iter_waves(4):
+            yield sum(bits.bit_count() for bits in wave.values())
+    elif TILED:
+        with TiledGrid(grid) as tiles:
+            yield from tiles.iter_waves(4)
+            grid[:] = tiles.grid()
+    else:
+        flat = grid.reshape(-1)
+        for wave in iter_waves(grid, 4):
+            flat[wave] = False
+            yield len(wave)
+
+
+if __name__ == "__main__":
+    # Read the grid (line number prefixes are skipped)
+    if BITSET:
+        grid = BitGrid.load('4.csv')
+        rows, cols = len(grid), grid.width
+        initial_rolls = grid.count()
+    else:
+        grid = load_grid('4.csv')
+        rows, cols = grid.shape
+        initial_rolls = int(grid.sum())
+
+    print(f"Matrix dimensions: {rows} rows x {cols} columns")
+
+    # Count initial rolls
+    print(f"Initial number of rolls: {initial_rolls}")
+
+    # Iteratively remove rolls with fewer than 4 adjacent rolls. Neighbor
+    # counts are computed once and only the neighbors of removed rolls are
+    # re-checked, instead of rescanning the grid every wave.
+    iteration = 0
+    total_removed = 0
+
+    for removed_this_iteration in remove_waves(grid):
+        iteration += 1
+        total_removed += removed_this_iteration
+
+        print(f"Iteration {iteration}: Removed {removed_this_iteration} rolls "
+              f"(total removed: {total_removed})")
+
+    print(f"\nNo more rolls to remove after iteration {iteration}")
+
+    # Count final rolls
+    final_rolls = grid.count() if BITSET else int(grid.sum())
+    print(f"\nFinal number of rolls: {final_rolls}")
+    print(f"Total rolls removed: {total_removed}")
+    print(f"Verification: {initial_rolls} - {total_removed} = {final_rolls}")
+
+    # Write the result to a new file
+    if BITSET:
+        grid.save('4_processed.csv')
+    else:
+        save_grid(grid, '4_processed.csv')
+
+    print("\nProcessed matrix saved to '4_processed.csv'")
@@ -0,0 +1,160 @@
+"""
+Bit-packed backend for the day 4 roll grids.
+
+Each row is one arbitrary-precision Python int whose bit j is set when
+column j holds a roll, so a cell costs one bit instead of a string
+object. The neighbors of a whole row are shifted copies of it and of the
+rows above and below, and their per-column sum is kept as bit planes
+(one int per binary digit of the count) built with ripple-carry adders.
+Comparing those planes with the threshold gives every accessible roll of
+a row in a handful of big-int operations.
+"""
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+from rolls import EMPTY, LINE_MARK, NEIGHBORHOODS, ROLL
+
+# A roll byte is a 1 bit and any other byte an empty 0 bit
+TO_BITS = b'0' * ord(ROLL) + b'1' + b'0' * (255 - ord(ROLL))
+FROM_BITS = str.maketrans({'1': ROLL, '0': EMPTY})
+
+
+def add_plane(counts: List[int], plane: int):
+    """Add a 0/1 plane to the bit planes of per-column counts, in place."""
+    carry = plane
+    for i, digit in enumerate(counts):
+        if not carry:
+            return
+        counts[i], carry = digit ^ carry, digit & carry
+    if carry:
+        counts.append(carry)
+
+
+def less_than(counts: List[int], threshold: int, mask: int) -> int:
+    """Columns (within mask) whose count planes are below threshold."""
+    below = 0
+    equal = mask
+    for i in reversed(range(max(len(counts), threshold.bit_length()))):
+        digit = counts[i] if i < len(counts) else 0
+        if threshold >> i & 1:
+            below |= equal & ~digit
+            equal &= digit
+        else:
+            equal &= ~digit
+    return below
+
+
+class BitGrid:
+    """Grid of rolls stored as one int bitset per row."""
+
+    def __init__(self, rows: List[int], width: int):
+        self.rows = rows
+        self.width = width
+        self.mask = (1 << width) - 1
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> 'BitGrid':
+        """Parse text rows the way rolls.parse_grid does."""
+        rows = []
+        width = 0
+        for line in lines:
+            if line.strip():
+                content = (line.split(LINE_MARK)[1].strip()
+                           if LINE_MARK in line else line.strip())
+                width = max(width, len(content))
+                # Column 0 becomes the lowest bit; anything but a roll
+                # is an empty cell, and non-ASCII characters encode to a
+                # single '?' so every column stays one byte
+                bits = content.encode('ascii', 'replace').translate(
+                    TO_BITS)[::-1]
+                rows.append(int(bits, 2) if bits else 0)
+        return cls(rows, width)
+
+    @classmethod
+    def load(cls, filename: str) -> 'BitGrid':
+        """Read a day 4 file straight into bitsets."""
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls.from_lines(f)
+
+    @classmethod
+    def from_array(cls, grid: np.ndarray) -> 'BitGrid':
+        """Pack a boolean grid."""
+        weights = np.packbits(grid, axis=1, bitorder='little')
+        return cls([int.from_bytes(row.tobytes(), 'little')
+                    for row in weights], grid.shape[1])
+
+    def to_array(self) -> np.ndarray:
+        """Unpack into a boolean grid."""
+        size = (self.width + 7) // 8
+        packed = np.frombuffer(
+            b''.join(row.to_bytes(size, 'little') for row in self.rows),
+            dtype=np.uint8,
+        ).reshape(len(self.rows), size)
+        return np.unpackbits(packed, axis=1, count=self.width,
+                             bitorder='little').astype(bool)
+
+    def format_row(self, i: int) -> str:
+        """Row i as an '@'/'.' string."""
+        bits = format(self.rows[i], f'0{self.width}b')[::-1]
+        return bits.translate(FROM_BITS)
+
+    def save(self, filename: str):
+        """Write the grid in the numbered format of rolls.save_grid."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            for i in range(len(self.rows)):
+                f.write(f"{i + 1:>6}{LINE_MARK}{self.format_row(i)}\n")
+
+    def count(self) -> int:
+        """Number of rolls."""
+        return sum(row.bit_count() for row in self.rows)
+
+    def _row(self, i: int) -> int:
+        return self.rows[i] if 0 <= i < len(self.rows) else 0
+
+    def neighbor_planes(self, i: int, neighborhood: int = 8) -> List[int]:
+        """Bit planes of the neighbor count of every column of row i."""
+        counts: List[int] = []
+        for di, dj in NEIGHBORHOODS[neighborhood]:
+            row = self._row(i + di)
+            # The neighbor at column j + dj lands on column j
+            plane = row >> dj if dj > 0 else row << -dj
+            add_plane(counts, plane & self.mask)
+        return counts
+
+    def accessible_row(self, i: int, threshold: int = 4,
+                       neighborhood: int = 8) -> int:
+        """Rolls of row i with fewer than `threshold` neighboring rolls."""
+        return less_than(self.neighbor_planes(i, neighborhood), threshold,
+                         self.rows[i])
+
+    def accessible(self, threshold: int = 4,
+                   neighborhood: int = 8) -> List[int]:
+        """Accessible rolls of every row."""
+        return [self.accessible_row(i, threshold, neighborhood)
+                for i in range(len(self.rows))]
+
+    def iter_waves(self, threshold: int = 4,
+                   neighborhood: int = 8) -> Iterator[Dict[int, int]]:
+        """
+        Remove rolls in waves, in place, yielding {row: removed bits} for
+        each wave. Only rows next to a row that changed in the previous
+        wave are re-examined.
+        """
+        dirty = range(len(self.rows))
+        while True:
+            wave = {}
+            for i in dirty:
+                removed = self.accessible_row(i, threshold, neighborhood)
+                if removed:
+                    wave[i] = removed
+            if not wave:
+                return
+            for i, removed in wave.items():
+                self.rows[i] &= ~removed
+            yield wave
+            dirty = sorted({j for i in wave for j in (i - 1, i, i + 1)
+                            if 0 <= j < len(self.rows)})
@@ -0,0 +1,152 @@
+"""
+Vectorized engine for the day 4 paper-roll grids.
+
+The grid is a boolean NumPy array (True where there is a roll). The
+number of rolls around every cell comes from adding the eight shifted
+views of a zero-padded copy, so the whole grid is handled in a few
+array operations instead of a Python loop with bounds checks per cell.
+
+Removal peels the grid like a k-core: neighbor counts are computed once,
+and each wave removes every roll below the threshold at the same time.
+Only the neighbors of the removed rolls lose a neighbor, so only they
+can join the next wave. Every roll is removed at most once and touches
+its 8 neighbors when it is, so the whole process is linear in the grid
+size rather than one full rescan per wave.
+"""
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+ROLL = '@'
+EMPTY = '.'
+LINE_MARK = '→'
+
+# The 8 directions: up, down, left, right, and 4 diagonals
+DIRECTIONS = [
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1),
+]
+NEIGHBORHOODS = {
+    4: [(-1, 0), (0, -1), (0, 1), (1, 0)],
+    8: DIRECTIONS,
+}
+
+# Peel-depth values for cells without a roll and for rolls never removed
+NO_ROLL = 0
+SURVIVOR = np.iinfo(np.uint16).max
+
+
+def parse_grid(lines: Iterable[str]) -> np.ndarray:
+    """
+    Boolean grid of rolls from text lines, skipping blank lines and any
+    line-number prefix ending in '→'. Short rows are padded with empty
+    cells.
+    """
+    rows = []
+    for line in lines:
+        if line.strip():
+            content = (line.split(LINE_MARK)[1].strip()
+                       if LINE_MARK in line else line.strip())
+            rows.append(content)
+    width = max((len(row) for row in rows), default=0)
+    grid = np.zeros((len(rows), width), dtype=bool)
+    for i, row in enumerate(rows):
+        grid[i, :len(row)] = np.frombuffer(row.encode(), dtype=np.uint8) \
+            == ord(ROLL)
+    return grid
+
+
+def load_grid(filename: str) -> np.ndarray:
+    """Boolean grid of rolls from a day 4 file."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return parse_grid(f)
+
+
+def format_grid(grid: np.ndarray) -> List[str]:
+    """Rows of a grid as '@'/'.' strings."""
+    chars = np.where(grid, ord(ROLL), ord(EMPTY)).astype(np.uint8)
+    return [row.tobytes().decode() for row in chars]
+
+
+def save_grid(grid: np.ndarray, filename: str):
+    """Write a grid with a right-aligned line number before every row."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        for idx, row in enumerate(format_grid(grid), 1):
+            f.write(f"{idx:>6}{LINE_MARK}{row}\n")
+
+
+def neighbor_counts(grid: np.ndarray, neighborhood: int = 8) -> np.ndarray:
+    """Number of rolls among the 4 or 8 neighbors of every cell."""
+    rows, cols = grid.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = grid
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for di, dj in NEIGHBORHOODS[neighborhood]:
+        counts += padded[1 + di:rows + 1 + di, 1 + dj:cols + 1 + dj]
+    return counts
+
+
+def accessible(grid: np.ndarray, threshold: int = 4,
+               neighborhood: int = 8) -> np.ndarray:
+    """Rolls with fewer than `threshold` neighboring rolls."""
+    return grid & (neighbor_counts(grid, neighborhood) < threshold)
+
+
+def iter_waves(grid: np.ndarray, threshold: int = 4,
+               neighborhood: int = 8) -> Iterator[np.ndarray]:
+    """
+    Yield the flat (row-major) indices of the rolls removed in each wave,
+    where a wave removes every roll that has fewer than `threshold`
+    neighboring rolls after the previous wave.
+    """
+    rows, cols = grid.shape
+    width = cols + 2
+    # Work on padded flat arrays so neighbors never need bounds checks
+    present = np.zeros((rows + 2, width), dtype=bool)
+    present[1:-1, 1:-1] = grid
+    counts = np.zeros((rows + 2, width), dtype=np.int16)
+    counts[1:-1, 1:-1] = neighbor_counts(grid, neighborhood)
+    present = present.ravel()
+    counts = counts.ravel()
+    offsets = np.array([di * width + dj
+                        for di, dj in NEIGHBORHOODS[neighborhood]])
+
+    wave = np.flatnonzero(present & (counts < threshold))
+    while len(wave):
+        present[wave] = False
+        yield (wave // width - 1) * cols + wave % width - 1
+        neighbors = (wave[:, None] + offsets).ravel()
+        # Each neighbor loses one roll per removed cell around it
+        cells, lost = np.unique(neighbors, return_counts=True)
+        counts[cells] -= lost
+        wave = cells[present[cells] & (counts[cells] < threshold)]
+
+
+def remove_rolls(grid: np.ndarray, threshold: int = 4,
+                 neighborhood: int = 8) -> Tuple[np.ndarray, List[int]]:
+    """The grid left once no roll can be removed, and each wave's size."""
+    remaining = grid.copy()
+    flat = remaining.reshape(-1)
+    sizes = []
+    for wave in iter_waves(grid, threshold, neighborhood):
+        flat[wave] = False
+        sizes.append(len(wave))
+    return remaining, sizes
+
+
+def peel_depth(grid: np.ndarray, threshold: int = 4,
+               neighborhood: int = 8) -> np.ndarray:
+    """
+    uint16 map of the wave that removes each roll: NO_ROLL (0) for empty
+    cells, k for rolls removed in wave k, SURVIVOR (0xFFFF) for the rest.
+    """
+    depth = np.where(grid, SURVIVOR, NO_ROLL).astype(np.uint16)
+    flat = depth.reshape(-1)
+    for wave_num, wave in enumerate(
+            iter_waves(grid, threshold, neighborhood), 1):
+        if wave_num >= SURVIVOR:
+            raise ValueError(f"More than {SURVIVOR - 1} waves do not fit "
+                             f"a uint16 depth map")
+        flat[wave] = wave_num
+    return depth
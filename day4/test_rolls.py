@@ -0,0 +1,201 @@
+import numpy as np
+import pytest
+from bitgrid import BitGrid, add_plane, less_than
+from tiled import TiledGrid, split_bands
+from rolls import (NEIGHBORHOODS, NO_ROLL, SURVIVOR, parse_grid, load_grid,
+                   format_grid, save_grid, neighbor_counts, accessible,
+                   iter_waves, remove_rolls, peel_depth)
+
+EXAMPLE = """\
+..@@.@@@@.
+@@@.@.@.@@
+@@@@@.@.@@
+@.@@@@..@.
+@@.@@@@.@@
+.@@@@@@@.@
+.@.@.@.@@@
+@.@@@.@@@@
+.@@@@@@@@.
+@.@.@@@.@.
+"""
+
+
+def brute_counts(grid, neighborhood=8):
+    """Neighbor counts with the original per-cell bounds checks."""
+    rows, cols = grid.shape
+    counts = np.zeros((rows, cols), dtype=int)
+    for i in range(rows):
+        for j in range(cols):
+            for di, dj in NEIGHBORHOODS[neighborhood]:
+                ni, nj = i + di, j + dj
+                if 0 <= ni < rows and 0 <= nj < cols and grid[ni, nj]:
+                    counts[i, j] += 1
+    return counts
+
+
+def random_grid(rows, cols, density=0.6, seed=0):
+    return np.random.default_rng(seed).random((rows, cols)) < density
+
+
+def test_parse_grid_prefixes_and_padding():
+    """Test line-number prefixes, blank lines and ragged rows."""
+    grid = parse_grid(["     1→@.@\n", "\n", "@@\n"])
+    assert grid.tolist() == [[True, False, True], [True, True, False]]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test that a saved grid loads back unchanged."""
+    grid = random_grid(7, 5)
+    path = tmp_path / "grid.csv"
+    save_grid(grid, str(path))
+    assert path.read_text(encoding="utf-8").startswith("     1→")
+    assert np.array_equal(load_grid(str(path)), grid)
+    assert format_grid(grid[:1]) == [
+        "".join("@" if cell else "." for cell in grid[0])
+    ]
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 9), (9, 1), (13, 17)])
+def test_neighbor_counts_match_brute_force(shape):
+    """Test the shifted-slice sums against per-cell counting."""
+    grid = random_grid(*shape, seed=sum(shape))
+    assert np.array_equal(neighbor_counts(grid), brute_counts(grid))
+
+
+def test_accessible_example():
+    """Test the worked example: 13 rolls have fewer than 4 neighbors."""
+    grid = parse_grid(EXAMPLE.splitlines())
+    assert int(accessible(grid, 4).sum()) == 13
+
+
+def brute_waves(grid, threshold=4, neighborhood=8):
+    """Wave sizes and final grid from full rescans, as the script did."""
+    grid = grid.copy()
+    sizes = []
+    while True:
+        wave = grid & (brute_counts(grid, neighborhood) < threshold)
+        if not wave.any():
+            return grid, sizes
+        grid &= ~wave
+        sizes.append(int(wave.sum()))
+
+
+def test_remove_rolls_example():
+    """Test the worked example: 43 rolls removed in waves."""
+    grid = parse_grid(EXAMPLE.splitlines())
+    remaining, sizes = remove_rolls(grid)
+    assert sizes == [13, 12, 7, 5, 2, 1, 1, 1, 1]
+    assert int(grid.sum() - remaining.sum()) == 43
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_waves_match_full_rescans(seed):
+    """Test each wave's cells and the final grid against rescanning."""
+    grid = random_grid(23, 31, density=0.7, seed=seed)
+    expected, sizes = brute_waves(grid)
+    remaining, peeled = remove_rolls(grid)
+    assert peeled == sizes
+    assert np.array_equal(remaining, expected)
+
+    previous = grid.copy()
+    for wave in iter_waves(grid):
+        cells = np.zeros(grid.size, dtype=bool)
+        cells[wave] = True
+        expected_wave = previous & (brute_counts(previous) < 4)
+        assert np.array_equal(cells.reshape(grid.shape), expected_wave)
+        previous &= ~expected_wave
+
+
+@pytest.mark.parametrize("threshold, neighborhood",
+                         [(4, 8), (2, 8), (6, 8), (2, 4), (3, 4)])
+def test_peel_depth_matches_rescans(threshold, neighborhood):
+    """Test the depth map for other thresholds and 4-neighborhoods."""
+    grid = random_grid(19, 27, density=0.75, seed=threshold)
+    depth = peel_depth(grid, threshold, neighborhood)
+    assert depth.dtype == np.uint16
+    assert np.array_equal(depth == NO_ROLL, ~grid)
+
+    previous = grid.copy()
+    wave_num = 0
+    while True:
+        wave = previous & (brute_counts(previous, neighborhood) < threshold)
+        if not wave.any():
+            break
+        wave_num += 1
+        assert np.array_equal(depth == wave_num, wave)
+        previous &= ~wave
+    assert np.array_equal(depth == SURVIVOR, previous)
+    assert remove_rolls(grid, threshold, neighborhood)[1] == \
+        brute_waves(grid, threshold, neighborhood)[1]
+
+
+def test_bit_plane_adders():
+    """Test per-column counts held as bit planes and compared."""
+    counts = []
+    for plane in (0b1011, 0b0011, 0b0001, 0b0101):
+        add_plane(counts, plane)
+    # Column counts, lowest column first: 4, 2, 1, 1
+    values = [sum((counts[i] >> j & 1) << i for i in range(len(counts)))
+              for j in range(4)]
+    assert values == [4, 2, 1, 1]
+    assert less_than(counts, 2, 0b1111) == 0b1100
+    assert less_than(counts, 4, 0b0111) == 0b0110
+    assert less_than(counts, 9, 0b1111) == 0b1111
+
+
+def test_bitgrid_round_trips(tmp_path):
+    """Test packing, text parsing and saving against the array engine."""
+    grid = random_grid(9, 70, seed=24)
+    bits = BitGrid.from_array(grid)
+    assert np.array_equal(bits.to_array(), grid)
+    assert bits.count() == int(grid.sum())
+
+    path = tmp_path / "grid.csv"
+    save_grid(grid, str(path))
+    loaded = BitGrid.load(str(path))
+    assert loaded.rows == bits.rows and loaded.width == 70
+    copy = tmp_path / "copy.csv"
+    loaded.save(str(copy))
+    assert copy.read_text(encoding="utf-8") == path.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("threshold, neighborhood",
+                         [(4, 8), (1, 8), (7, 8), (2, 4), (4, 4)])
+def test_bitgrid_matches_array_engine(threshold, neighborhood):
+    """Test bitset neighbor thresholds and waves against NumPy."""
+    grid = random_grid(21, 67, density=0.7, seed=threshold + neighborhood)
+    bits = BitGrid.from_array(grid)
+    rows = BitGrid(bits.accessible(threshold, neighborhood), bits.width)
+    assert np.array_equal(rows.to_array(),
+                          accessible(grid, threshold, neighborhood))
+
+    remaining, sizes = remove_rolls(grid, threshold, neighborhood)
+    assert [sum(row.bit_count() for row in wave.values())
+            for wave in bits.iter_waves(threshold, neighborhood)] == sizes
+    assert np.array_equal(bits.to_array(), remaining)
+
+
+def test_split_bands():
+    """Test that bands cover every row once, even with too many parts."""
+    assert split_bands(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert split_bands(2, 5) == [(0, 1), (1, 2)]
+
+
+@pytest.mark.parametrize("threshold, neighborhood, bands",
+                         [(4, 8, 3), (3, 8, 7), (2, 4, 5)])
+def test_tiled_matches_serial(threshold, neighborhood, bands):
+    """Test tiled counts, waves and final grid against the serial run."""
+    grid = random_grid(41, 29, density=0.7, seed=bands)
+    remaining, sizes = remove_rolls(grid, threshold, neighborhood)
+    with TiledGrid(grid, num_workers=2, bands_per_worker=bands) as tiles:
+        assert tiles.count_accessible(threshold, neighborhood) == \
+            int(accessible(grid, threshold, neighborhood).sum())
+        assert list(tiles.iter_waves(threshold, neighborhood)) == sizes
+        assert np.array_equal(tiles.grid(), remaining)
+
+
+def test_bitgrid_treats_other_characters_as_empty():
+    """Test that unknown cells parse as empty, like parse_grid."""
+    lines = ["     1→@x@\n", "#@ .\n"]
+    bits = BitGrid.from_lines(lines)
+    assert np.array_equal(bits.to_array(), parse_grid(lines))
@@ -0,0 +1,132 @@
+"""
+Tiled multi-process solver for large day 4 roll grids.
+
+The grid lives in two shared-memory buffers (multiprocessing
+.shared_memory) and is split into bands of rows. For every wave each
+worker copies its band plus a one-row halo above and below out of the
+current buffer, counts neighbors there, and writes the band with its
+removed rolls cleared into the other buffer. The buffers swap after the
+wave, so the halos every band reads next are exactly the rows its
+neighbors just wrote, and all workers see the grid as it was before the
+wave: the same semantics as the serial engine.
+
+Bands whose own rows and halos did not change in the last wave cannot
+change now, so they are only copied across.
+"""
+from multiprocessing import Pool, cpu_count, shared_memory
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from rolls import neighbor_counts
+
+# Shared buffers attached in each worker process
+_BUFFERS: List[np.ndarray] = []
+_SEGMENTS: List[shared_memory.SharedMemory] = []
+
+
+def _attach(names: List[str], shape: Tuple[int, int]):
+    """Pool initializer: map the shared grid buffers in a worker."""
+    for name in names:
+        segment = shared_memory.SharedMemory(name=name)
+        _SEGMENTS.append(segment)
+        _BUFFERS.append(np.ndarray(shape, dtype=bool, buffer=segment.buf))
+
+
+def split_bands(rows: int, parts: int) -> List[Tuple[int, int]]:
+    """Split rows into up to `parts` contiguous [begin, end) bands."""
+    bounds = np.linspace(0, rows, max(1, parts) + 1).astype(int)
+    return [(int(begin), int(end)) for begin, end in zip(bounds, bounds[1:])
+            if end > begin]
+
+
+def band_wave(args: Tuple[int, int, int, int, int, bool]) -> int:
+    """
+    Remove the accessible rolls of rows [begin, end) from buffer
+    `source` into the other buffer, and return how many there were.
+    """
+    source, begin, end, threshold, neighborhood, active = args
+    current, following = _BUFFERS[source], _BUFFERS[1 - source]
+    if not active:
+        following[begin:end] = current[begin:end]
+        return 0
+    # Copy the band together with its halo rows
+    top = max(begin - 1, 0)
+    local = current[top:min(end + 1, len(current))].copy()
+    rows = slice(begin - top, end - top)
+    band = local[rows]
+    removed = band & (neighbor_counts(local, neighborhood)[rows]
+                      < threshold)
+    following[begin:end] = band & ~removed
+    return int(removed.sum())
+
+
+class TiledGrid:
+    """A grid in shared memory with a process pool working on bands."""
+
+    def __init__(self, grid: np.ndarray, num_workers: int = None,
+                 bands_per_worker: int = 2):
+        if num_workers is None:
+            num_workers = cpu_count()
+        self.shape = grid.shape
+        size = max(1, grid.size)
+        self._segments = [shared_memory.SharedMemory(create=True, size=size)
+                          for _ in range(2)]
+        self.buffers = [np.ndarray(self.shape, dtype=bool, buffer=seg.buf)
+                        for seg in self._segments]
+        self.buffers[0][:] = grid
+        self.current = 0
+        self.bands = split_bands(self.shape[0],
+                                 num_workers * bands_per_worker)
+        self.pool = Pool(num_workers, initializer=_attach,
+                         initargs=([seg.name for seg in self._segments],
+                                   self.shape))
+
+    def __enter__(self) -> 'TiledGrid':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        self.pool.terminate()
+        self.pool.join()
+        self.buffers = []
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def grid(self) -> np.ndarray:
+        """A copy of the grid as it is now."""
+        return self.buffers[self.current].copy()
+
+    def _wave(self, threshold: int, neighborhood: int,
+              active: List[bool]) -> List[int]:
+        """Run one wave over all bands and return the removals per band."""
+        tasks = [(self.current, begin, end, threshold, neighborhood, on)
+                 for (begin, end), on in zip(self.bands, active)]
+        return self.pool.map(band_wave, tasks)
+
+    def count_accessible(self, threshold: int = 4,
+                         neighborhood: int = 8) -> int:
+        """Rolls with fewer than `threshold` neighbors, grid unchanged."""
+        return sum(self._wave(threshold, neighborhood,
+                              [True] * len(self.bands)))
+
+    def iter_waves(self, threshold: int = 4,
+                   neighborhood: int = 8) -> Iterator[int]:
+        """Remove rolls wave by wave, yielding each wave's size."""
+        active = [True] * len(self.bands)
+        while True:
+            removed = self._wave(threshold, neighborhood, active)
+            if not any(removed):
+                return
+            self.current = 1 - self.current
+            yield sum(removed)
+            # Halos are one row deep, so only neighbors of changed bands
+            # can change in the next wave
+            changed = [count > 0 for count in removed]
+            active = [any(changed[max(b - 1, 0):b + 2])
+                      for b in range(len(changed))]